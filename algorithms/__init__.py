@@ -0,0 +1,35 @@
+import importlib
+
+# Solver name -> (module, class). Modules are imported on first use so that
+# importing the package stays cheap.
+SOLVERS = {
+    "bfs": ("algorithms.bfs", "MazeSolverBFS"),
+    "dfs": ("algorithms.dfs", "MazeSolverDFS"),
+    "ucs": ("algorithms.ucs", "MazeSolverUCS"),
+    "astar": ("algorithms.astar", "MazeSolverAStar"),
+    "gbfs": ("algorithms.gbfs", "MazeSolverGBFS"),
+    "anytime": ("algorithms.anytime", "MazeSolverAnytimeAStar"),
+    "deadend": ("algorithms.deadend", "MazeSolverDeadEnd"),
+    "external": ("algorithms.external", "MazeSolverExternalBFS"),
+    "parallel": ("algorithms.parallel", "MazeSolverParallelBFS"),
+    "bitbfs": ("algorithms.bitbfs", "MazeSolverBitBFS"),
+}
+
+_CLASSES = {class_name: module for module, class_name in SOLVERS.values()}
+
+
+def solver_class(name):
+    try:
+        module, class_name = SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"unknown solver {name!r}, expected one of {sorted(SOLVERS)}")
+    return getattr(importlib.import_module(module), class_name)
+
+
+def __getattr__(name):
+    if name in _CLASSES:
+        return getattr(importlib.import_module(_CLASSES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["SOLVERS", "solver_class", *_CLASSES]
@@ -0,0 +1,47 @@
+import argparse
+import inspect
+import sys
+
+from algorithms import SOLVERS, solver_class
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m algorithms", description="Solve a maze file.")
+    parser.add_argument("algorithm", choices=sorted(SOLVERS))
+    parser.add_argument("maze", help="maze text file ('#' walls, 'A' start, 'B' goal)")
+    parser.add_argument("--image", help="write the solved maze to this PNG file")
+    parser.add_argument("--landmarks", type=int, metavar="K",
+                        help="use K ALT landmarks, cached beside the maze (A* only)")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS",
+                        help="stop after this much time and report the best partial path")
+    parser.add_argument("--max-expansions", type=int, metavar="N",
+                        help="stop after expanding N cells and report the best partial path")
+    args = parser.parse_args(argv)
+
+    solver = solver_class(args.algorithm)(args.maze)
+    if args.landmarks:
+        if args.algorithm not in ("astar", "anytime"):
+            parser.error("--landmarks is only used by astar and anytime")
+        solver.index_landmarks(args.landmarks)
+    bounds = {name: value for name, value in
+              (("deadline", args.deadline), ("max_expansions", args.max_expansions)) if value is not None}
+    if bounds and not set(bounds) <= set(inspect.signature(solver.solve).parameters):
+        parser.error(f"{args.algorithm} does not support --deadline or --max-expansions")
+
+    path = solver.solve(**bounds)
+    if path is None:
+        print("No solution")
+        return 1
+    partial = getattr(solver, "partial", False)
+    if partial:
+        print(f"Partial path length: {len(path)} (stopped by {solver.stats['stopped']}, "
+              f"{solver.stats['estimate']} from the goal)")
+    else:
+        print(f"Path length: {len(path)}")
+    if args.image:
+        solver.output_image(args.image)
+    return 1 if partial else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
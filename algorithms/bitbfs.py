@@ -0,0 +1,231 @@
+import time
+
+from algorithms.components import ComponentIndex
+from algorithms.grid import Grid
+from algorithms.search import draw_solution
+
+
+class MazeSolverBitBFS:
+    """Breadth-first search on bitboards held in Python ints, one per band
+    of rows.
+
+    Rows are grouped into bands of `band_rows` rows, about `band_bits` bits
+    each. In a band, cell (y, x) is bit (y % band_rows) * stride + x, with
+    stride = width + 1 so that every row ends in a zero guard bit and
+    horizontal shifts cannot wrap into the next row. One BFS layer visits
+    only the bands the frontier occupies:
+
+        next[b] |= (f << 1 | f >> 1 | f << stride | f >> stride) & unseen[b]
+
+    plus the first and last rows of f spilling into bands b - 1 and b + 1,
+    which handles hundreds of cells per bytecode without touching the
+    rest of the grid. Wider bands suit mazes with loops, where a layer
+    spans many rows; narrower ones suit perfect mazes, whose frontier is a
+    few cells scattered over dead-end branches. Unless `band_bits` is set,
+    index_bands picks the width from how many loops the maze has.
+
+    For the walk back from the goal, two more bitboards per band hold each
+    visited cell's depth mod 3. A neighbour's depth differs by at most one,
+    so the cell one step closer to the start is the visited neighbour at
+    depth - 1 mod 3; this takes two bits per cell however deep the search.
+    """
+
+    name = "bit-parallel BFS"
+    image_name = "bitbfs_solution.png"
+    band_bits = None
+    # Band widths for mazes with and without many loops, and the share of
+    # extra free-cell adjacencies (one per independent loop) between them
+    loop_band_bits = 1 << 16
+    tree_band_bits = 1 << 10
+    loop_share = 0.01
+
+    def __init__(self, filename):
+        self.load_maze(filename)
+
+    def load_maze(self, filename):
+        with open(filename) as f:
+            self.maze = [list(line.strip()) for line in f.readlines()]
+        self.start = self.find_position('A')
+        self.goal = self.find_position('B')
+        self.components = None
+        self.index_bands()
+
+    def index_bands(self):
+        """Builds the free-cell bitboards from self.maze."""
+        self.height = len(self.maze)
+        self.width = max((len(row) for row in self.maze), default=0)
+        self.stride = self.width + 1
+        # Rows padded with walls up to the guard bit, as binary text with
+        # the lowest bit last, the order int(text, 2) reads it in
+        rows = [''.join(row).ljust(self.stride, '#')[::-1] for row in self.maze]
+        table = {ord(c): '0' if c == '#' else '1' for c in set().union(*rows)}
+        rows = [row.translate(table) for row in rows]
+        band_bits = self.band_bits or self.pick_band_bits([int(row, 2) for row in rows])
+        self.band_rows = max(1, band_bits // self.stride)
+        self.bands = [int(''.join(reversed(rows[top:top + self.band_rows])) or '0', 2)
+                      for top in range(0, self.height, self.band_rows)]
+
+    def index_components(self):
+        """Labels connected regions once, as MazeSolver.index_components
+        does, so that searches for a goal the start cannot reach return
+        None without flooding the start's region."""
+        self.components = ComponentIndex(Grid(self.maze))
+        return self.components
+
+    def pick_band_bits(self, rows):
+        """Band width for a maze given as one bitboard per row. A connected
+        maze has free cells - 1 adjacencies plus one per independent loop."""
+        cells = sum(row.bit_count() for row in rows)
+        adjacent = sum((row & row >> 1).bit_count() for row in rows)
+        adjacent += sum((upper & lower).bit_count() for upper, lower in zip(rows, rows[1:]))
+        loops = adjacent - cells
+        return self.loop_band_bits if loops >= self.loop_share * cells else self.tree_band_bits
+
+    def find_position(self, char):
+        for y, row in enumerate(self.maze):
+            for x, col in enumerate(row):
+                if col == char:
+                    return (y, x)
+        return None
+
+    def solve(self, deadline=None, max_expansions=None):
+        """Solves the maze. `deadline` (seconds) and `max_expansions` bound
+        the search as in MazeSolver.solve, checked between layers."""
+        start_time = time.perf_counter()
+        stop_at = None if deadline is None else start_time + deadline
+        self.solution = self.search(stop_at, max_expansions)
+        end_time = time.perf_counter()
+        print(f"Time taken by {self.name}: {(end_time - start_time) * 1_000_000:.2f} µs")
+        return self.solution
+
+    def output_image(self, filename=None):
+        draw_solution(filename or self.image_name, self.maze, self.start, self.goal, self.solution)
+
+    def bit(self, position):
+        """(band, bit) of a (y, x) position."""
+        band, row = divmod(position[0], self.band_rows)
+        return band, row * self.stride + position[1]
+
+    def search(self, stop_at=None, max_expansions=None):
+        self.num_explored = 0
+        self.partial = False
+        self.stats = {"explored": 0, "frontier": 0, "stopped": None}
+        if self.start is None or self.goal is None:
+            return None
+        bands = self.bands
+        count = len(bands)
+        stride = self.stride
+        last_row = (self.band_rows - 1) * stride
+        first_row = (1 << stride) - 1
+        start_band, start_bit = self.bit(self.start)
+        goal_band, goal_bit = self.bit(self.goal)
+        goal_mask = 1 << goal_bit
+        if not (bands[start_band] >> start_bit & 1 and bands[goal_band] & goal_mask):
+            return None
+        if self.components is not None and not self.components.connected(
+                self.start[0] * self.width + self.start[1], self.goal[0] * self.width + self.goal[1]):
+            return None
+
+        unseen = list(bands)
+        unseen[start_band] ^= 1 << start_bit
+        # Depth mod 3 of every visited cell, as bit 0 and bit 1 bitboards
+        low, high = [0] * count, [0] * count
+        frontier = {start_band: 1 << start_bit}
+        depth = 0
+        expanded = 0
+        stopped = None
+        while not frontier.get(goal_band, 0) & goal_mask:
+            if max_expansions is not None:
+                if expanded >= max_expansions:
+                    stopped = "max_expansions"
+                    break
+                expanded += sum(f.bit_count() for f in frontier.values())
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                stopped = "deadline"
+                break
+            reached = {}
+            get = reached.get
+            for b, f in frontier.items():
+                spread = (f << 1 | f >> 1 | f << stride | f >> stride) & unseen[b]
+                if spread:
+                    reached[b] = get(b, 0) | spread
+                if b:
+                    up = (f & first_row) << last_row & unseen[b - 1]
+                    if up:
+                        reached[b - 1] = get(b - 1, 0) | up
+                if b + 1 < count:
+                    down = f >> last_row & unseen[b + 1]
+                    if down:
+                        reached[b + 1] = get(b + 1, 0) | down
+            if not reached:
+                break
+            depth += 1
+            mod = depth % 3
+            for b, f in reached.items():
+                unseen[b] ^= f
+                if mod == 1:
+                    low[b] |= f
+                elif mod == 2:
+                    high[b] |= f
+            frontier = reached
+        self.num_explored = sum((free & ~left).bit_count() for free, left in zip(bands, unseen))
+        self.stats = {"explored": self.num_explored, "stopped": stopped,
+                      "frontier": sum(f.bit_count() for f in frontier.values()) if stopped else 0}
+        visited = [free & ~left for free, left in zip(bands, unseen)]
+        end = self.goal
+        if stopped is not None:
+            end, estimate = self.closest_visited(visited)
+            self.partial = True
+            self.stats["closest"] = end
+            self.stats["estimate"] = estimate
+        elif not frontier.get(goal_band, 0) & goal_mask:
+            return None
+
+        # Walk back in (band, bit) coordinates. A step left from bit 0 or
+        # right from the last bit of a row lands on a wall or guard bit, so
+        # only vertical steps need to cross into the next band.
+        span = self.band_rows * stride
+        band, bit = self.bit(end)
+        start = self.bit(self.start)
+        mod = (low[band] >> bit & 1) + 2 * (high[band] >> bit & 1)
+        cells = [(band, bit)]
+        while (band, bit) != start:
+            mod = mod - 1 if mod else 2
+            up = (band, bit - stride) if bit >= stride else (band - 1, bit - stride + span)
+            down = (band, bit + stride) if bit + stride < span else (band + 1, bit + stride - span)
+            for b, p in ((band, bit - 1), (band, bit + 1), up, down):
+                if (0 <= b < count and p >= 0 and visited[b] >> p & 1
+                        and (low[b] >> p & 1) + 2 * (high[b] >> p & 1) == mod):
+                    band, bit = b, p
+                    break
+            cells.append((band, bit))
+        rows = self.band_rows
+        path = [(b * rows + p // stride, p % stride) for b, p in reversed(cells)]
+        return path
+
+    def closest_visited(self, visited):
+        """(position, Manhattan distance to the goal) of the visited cell
+        nearest the goal, given per-band bitboards of visited cells."""
+        gy, gx = self.goal
+        stride, rows = self.stride, self.band_rows
+        row_mask = (1 << stride) - 1
+        below = (1 << gx + 1) - 1
+        best, best_distance = self.start, None
+        for y in range(self.height):
+            cells = visited[y // rows] >> (y % rows * stride) & row_mask
+            if not cells:
+                continue
+            # Nearest visited cell at or right of gx, and at or left of it
+            right, left = cells >> gx, cells & below
+            for x in ((gx + (right & -right).bit_length() - 1) if right else None,
+                      (left.bit_length() - 1) if left else None):
+                if x is not None:
+                    distance = abs(y - gy) + abs(x - gx)
+                    if best_distance is None or distance < best_distance:
+                        best, best_distance = (y, x), distance
+        return best, best_distance
+
+
+if __name__ == "__main__":
+    solver = MazeSolverBitBFS("complex_maze.txt")
+    solver.solve()
@@ -0,0 +1,36 @@
+from array import array
+
+
+class ComponentIndex:
+    """Connected-component label for every cell of a Grid.
+
+    Built with one flood fill over the grid's adjacency; walls get -1.
+    Two cells are mutually reachable iff they share a label, so an
+    unsolvable query is rejected with two array lookups instead of a
+    search of the whole reachable region.
+    """
+
+    def __init__(self, grid):
+        offsets, targets, free = grid.offsets, grid.targets, grid.free
+        labels = array('i', [-1]) * grid.size
+        count = 0
+        for seed in range(grid.size):
+            if not free[seed] or labels[seed] >= 0:
+                continue
+            labels[seed] = count
+            stack = [seed]
+            while stack:
+                cell = stack.pop()
+                for k in range(offsets[cell], offsets[cell + 1]):
+                    neighbor = targets[k]
+                    if labels[neighbor] < 0:
+                        labels[neighbor] = count
+                        stack.append(neighbor)
+            count += 1
+        self.labels = labels
+        self.count = count
+
+    def connected(self, a, b):
+        """Whether flat cell indices a and b are open and reachable from each other."""
+        label = self.labels[a]
+        return label >= 0 and label == self.labels[b]
@@ -0,0 +1,182 @@
+import time
+from array import array
+
+import numpy as np
+
+from algorithms.bfs import MazeSolverBFS
+from algorithms.bitbfs import MazeSolverBitBFS
+from algorithms.grid import Grid
+from algorithms.parallel import MazeSolverParallelBFS
+from algorithms.search import MazeSolver, SearchEvents, check_budget
+
+
+def fill_dead_ends(maze, keep=(), stop_at=None, max_filled=None):
+    """Wall off dead-end cells of `maze` (a list of row lists) in place.
+
+    A dead end is a free cell with at most one free neighbour; A, B and the
+    (y, x) cells in `keep` are never filled. Filling repeats until nothing
+    changes, so every branch that cannot lie on a path between A and B is
+    removed. Returns the filled cells as an array of (y, x) rows.
+
+    With `stop_at` (a time.perf_counter() value), filling ends after the
+    round in which it passes; at most `max_filled` cells are filled. Any
+    subset of the dead ends can be filled, so a partly filled maze still
+    has every path between the kept cells.
+    """
+    if stop_at is not None and time.perf_counter() >= stop_at:
+        return np.empty((0, 2), dtype=np.intp)
+    height = len(maze)
+    width = max((len(row) for row in maze), default=0)
+
+    # Pad with a ring of walls so the shifted views below never go out of range
+    free = np.zeros((height + 2, width + 2), dtype=np.uint8)
+    text = ''.join(''.join(row).ljust(width, '#') for row in maze)
+    cells = np.frombuffer(text.encode("utf-32-le"), dtype="<u4").reshape(height, width)
+    free[1:-1, 1:-1] = cells != ord('#')
+    keep_cells, keep = keep, (cells == ord('A')) | (cells == ord('B'))
+    for y, x in keep_cells:
+        if 0 <= y < height and 0 <= x < width:
+            keep[y, x] = True
+    core = free[1:-1, 1:-1]
+    original = core.astype(bool)
+
+    # Number of free cells around each cell. The first round counts them
+    # for the whole grid with shifted views; after that only neighbours of
+    # freshly filled cells can become dead ends, so later rounds gather
+    # counts on flat indices for just those candidates.
+    stride = width + 2
+    flat = free.ravel()
+    fixed = np.zeros_like(free, dtype=bool)
+    fixed[1:-1, 1:-1] = keep
+    fixed = fixed.ravel()
+    open_neighbors = free[:-2, 1:-1] + free[2:, 1:-1] + free[1:-1, :-2] + free[1:-1, 2:]
+    ys, xs = np.nonzero(original & ~keep & (open_neighbors <= 1))
+    dead = (ys + 1) * stride + xs + 1
+    count = 0
+    while dead.size:
+        if max_filled is not None:
+            dead = dead[:max_filled - count]
+        flat[dead] = 0
+        count += dead.size
+        if max_filled is not None and count >= max_filled:
+            break
+        if stop_at is not None and time.perf_counter() >= stop_at:
+            break
+        candidates = np.unique(np.concatenate((dead - stride, dead + stride, dead - 1, dead + 1)))
+        candidates = candidates[(flat[candidates] == 1) & ~fixed[candidates]]
+        open_neighbors = (flat[candidates - stride] + flat[candidates + stride]
+                          + flat[candidates - 1] + flat[candidates + 1])
+        dead = candidates[open_neighbors <= 1]
+
+    ys, xs = np.nonzero(original & (core == 0))
+    for y, x in zip(ys.tolist(), xs.tolist()):
+        maze[y][x] = '#'
+    return np.column_stack((ys, xs))
+
+
+def prune_dead_ends(solver):
+    """Pre-pass for the solvers in algorithms/ that hold their maze in
+    memory: fills its dead ends, keeping the solver's start and goal, and
+    rebuilds what the solver derived from the maze. Raises ValueError for
+    the others (external BFS, solvers built with from_source).
+
+    A MazeSolver goes back to its maze file if later retargeted, since the
+    pruned maze may have no path to the new endpoints."""
+    if isinstance(solver, MazeSolver):
+        supported = solver.maze is not None
+    else:
+        supported = isinstance(solver, (MazeSolverBitBFS, MazeSolverParallelBFS))
+    if not supported:
+        raise ValueError(f"cannot prune dead ends for {type(solver).__name__}: it has no maze in memory")
+    fill_dead_ends(solver.maze, [cell for cell in (solver.start, solver.goal) if cell is not None])
+    if isinstance(solver, MazeSolver):
+        solver.grid = Grid(solver.maze)
+        solver.pruned_for = (solver.start, solver.goal)
+    elif isinstance(solver, MazeSolverBitBFS):
+        solver.index_bands()
+    else:
+        solver.index_walls()
+    return solver
+
+
+class MazeSolverDeadEnd(MazeSolverBFS):
+    name = "dead-end filling"
+    image_name = "deadend_solution.png"
+
+    def iter_solve(self, batch_size=1024, start=None, goal=None, deadline=None, max_expansions=None):
+        """MazeSolver.iter_solve with the dead-end pre-pass first. The cells
+        it fills are reported as expanded, then the walk down the corridor
+        that is left; mazes with loops continue with BFS on the pruned grid.
+        Filled and walked cells count towards `max_expansions`."""
+        if self.maze is None:
+            raise ValueError("dead-end filling needs a maze loaded from a file")
+        # Goes back to the maze file if the last fill kept other endpoints
+        self.retarget(start, goal)
+        stop_at = None if deadline is None else time.perf_counter() + deadline
+        self.reset_stats()
+        endpoints = self.pruned_for = (self.start, self.goal)
+        filled = fill_dead_ends(self.maze, [cell for cell in endpoints if cell is not None],
+                                stop_at, max_expansions)
+        explored = len(filled)
+        record = batch_size is not None
+        if record:
+            filled = (filled[:, 0] * self.grid.width + filled[:, 1]).tolist()
+            for i in range(0, len(filled), batch_size):
+                yield SearchEvents(array('i', filled[i:i + batch_size]), array('i'))
+            expanded = array('i')
+        # The old grid is a superset of the pruned one, so it stays usable
+        # if the budget runs out before it is rebuilt.
+        stopped, next_check = check_budget(stop_at, max_expansions, explored)
+        if stopped is None and explored:
+            self.grid = Grid(self.maze)
+        grid = self.grid
+
+        # In a perfect maze only the solution corridor is left, so this walk
+        # never branches; mazes with loops fall back to BFS on the pruned grid.
+        path = [self.start] if None not in endpoints else None
+        previous = None
+        current = self.start
+        while path is not None and stopped is None:
+            explored += 1
+            if record:
+                expanded.append(grid.index(current))
+                if len(expanded) >= batch_size:
+                    yield SearchEvents(expanded, array('i'))
+                    expanded = array('i')
+            if current == self.goal:
+                break
+            if explored >= next_check:
+                stopped, next_check = check_budget(stop_at, max_expansions, explored)
+                if stopped is not None:
+                    break
+            options = [n for n in self.neighbors(current) if n != previous]
+            if len(options) != 1:
+                path = None
+                break
+            previous, current = current, options[0]
+            path.append(current)
+        if record and expanded:
+            yield SearchEvents(expanded, array('i'))
+
+        if path is None:
+            if max_expansions is not None:
+                max_expansions -= explored
+            self.solution = yield from self.search(batch_size, stop_at, max_expansions)
+            self.num_explored += explored
+            self.stats["explored"] = self.num_explored
+            return
+        self.record_stats(explored, 0, stopped)
+        if stopped is not None:
+            # The walk so far, cut at the cell nearest the goal
+            gy, gx = self.goal
+            estimates = [abs(y - gy) + abs(x - gx) for y, x in path]
+            end = estimates.index(min(estimates))
+            path = path[:end + 1]
+            self.record_partial(path[-1], estimates[end])
+        self.solution = path
+
+
+if __name__ == "__main__":
+    solver = MazeSolverDeadEnd("complex_maze.txt")
+    solver.solve()
+    solver.output_image("deadend_solution.png")
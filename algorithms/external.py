@@ -0,0 +1,317 @@
+import heapq
+import mmap
+import os
+import tempfile
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+from algorithms.search import draw_solution
+
+WALL = ord('#')
+RECORD = array('q').itemsize
+
+
+class MazeFile:
+    """Read-only view of a maze text file that loads rows in bands.
+
+    The file is memory-mapped and only row offsets are kept in memory; rows
+    are sliced out a band of `band_rows` at a time and the most recently
+    used `cached_bands` bands are kept. Columns are taken exactly as they
+    appear on each line, and cells past the end of a short line are walls.
+    """
+
+    def __init__(self, filename, band_rows=256, cached_bands=4):
+        self.file = open(filename, 'rb')
+        # An empty file cannot be mapped; empty bytes read the same way
+        if os.fstat(self.file.fileno()).st_size:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.mm = b''
+        self.band_rows = band_rows
+        self.cached_bands = cached_bands
+        self.bands = OrderedDict()
+
+        mm = self.mm
+        offsets, lengths = array('q'), array('q')
+        pos, size = 0, len(mm)
+        while pos < size:
+            end = mm.find(b'\n', pos)
+            if end < 0:
+                end = size
+            line_end = end - 1 if end > pos and mm[end - 1] == 13 else end
+            offsets.append(pos)
+            lengths.append(line_end - pos)
+            pos = end + 1
+        self.offsets = offsets
+        self.lengths = lengths
+        self.height = len(offsets)
+        self.width = max(lengths, default=0)
+
+    def close(self):
+        self.bands.clear()
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+        self.file.close()
+
+    def find(self, char):
+        pos = self.mm.find(char.encode())
+        if pos < 0:
+            return None
+        y = bisect_right(self.offsets, pos) - 1
+        return (y, pos - self.offsets[y])
+
+    def row(self, y):
+        band, i = divmod(y, self.band_rows)
+        rows = self.bands.get(band)
+        if rows is None:
+            first = band * self.band_rows
+            last = min(first + self.band_rows, self.height)
+            mm, offsets, lengths = self.mm, self.offsets, self.lengths
+            rows = [mm[offsets[r]:offsets[r] + lengths[r]] for r in range(first, last)]
+            self.bands[band] = rows
+            if len(self.bands) > self.cached_bands:
+                self.bands.popitem(last=False)
+        else:
+            self.bands.move_to_end(band)
+        return rows[i]
+
+    def free_neighbors(self, index):
+        """Free neighbours of a flat cell index (y * width + x), ascending."""
+        width = self.width
+        y, x = divmod(index, width)
+        result = []
+        if y > 0:
+            row = self.row(y - 1)
+            if x < len(row) and row[x] != WALL:
+                result.append(index - width)
+        row = self.row(y)
+        if x > 0 and row[x - 1] != WALL:
+            result.append(index - 1)
+        if x + 1 < len(row) and row[x + 1] != WALL:
+            result.append(index + 1)
+        if y + 1 < self.height:
+            row = self.row(y + 1)
+            if x < len(row) and row[x] != WALL:
+                result.append(index + width)
+        return result
+
+
+def read_records(f, start, count, chunk=1 << 16):
+    """Yields `count` int64 records from `f`, starting at record `start`.
+
+    Reads are positional, so several readers and an appender can share one
+    file without disturbing each other.
+    """
+    fd = f.fileno()
+    while count > 0:
+        n = min(chunk, count)
+        records = array('q')
+        records.frombytes(os.pread(fd, n * RECORD, start * RECORD))
+        yield from records
+        start += n
+        count -= n
+
+
+def contains_record(f, start, count, value):
+    """Binary search for `value` in a sorted run of records."""
+    lo, hi = start, start + count
+    fd = f.fileno()
+    while lo < hi:
+        mid = (lo + hi) // 2
+        found = int.from_bytes(os.pread(fd, RECORD, mid * RECORD), "little", signed=True)
+        if found < value:
+            lo = mid + 1
+        elif found > value:
+            hi = mid
+        else:
+            return True
+    return False
+
+
+class MazeSolverExternalBFS:
+    """Breadth-first search with the frontier and visited set on disk.
+
+    Every BFS layer is stored as a sorted run of int64 cell indices in one
+    file under `workdir`, and the record where each layer starts goes to
+    a second file. Neighbours of layer d are spilled to sorted runs of at
+    most `run_size` cells in a scratch file that is reused every level,
+    merged and deduplicated, and everything already in layers d and d - 1
+    is dropped. In an undirected grid that leaves exactly layer d + 1, so
+    older layers are never read during the forward pass. The path is
+    rebuilt backwards by looking up, layer by layer, a neighbour of the
+    current cell.
+
+    Memory does not grow with the maze or the search depth: it holds the
+    row offsets of the maze file, the `run_size` cell buffer, the
+    MazeFile band cache (`cached_bands` bands of `band_rows` rows) and one
+    read chunk for each run being merged.
+    """
+
+    name = "external BFS"
+    image_name = "external_solution.png"
+
+    def __init__(self, filename, workdir=None, band_rows=256, run_size=1 << 18):
+        self.filename = filename
+        self.workdir = workdir
+        self.band_rows = band_rows
+        self.run_size = run_size
+
+    def solve(self, deadline=None, max_expansions=None):
+        """Solves the maze. `deadline` (seconds) and `max_expansions` bound
+        the search as in MazeSolver.solve, checked between layers."""
+        start_time = time.perf_counter()
+        stop_at = None if deadline is None else start_time + deadline
+        maze = MazeFile(self.filename, band_rows=self.band_rows)
+        try:
+            with tempfile.TemporaryDirectory(dir=self.workdir) as tmp:
+                self.solution = self.search(maze, tmp, stop_at, max_expansions)
+        finally:
+            maze.close()
+        end_time = time.perf_counter()
+        print(f"Time taken by {self.name}: {(end_time - start_time) * 1_000_000:.2f} µs")
+        return self.solution
+
+    def search(self, maze, tmp, stop_at=None, max_expansions=None):
+        self.num_explored = 0
+        self.partial = False
+        self.stats = {"explored": 0, "frontier": 0, "stopped": None}
+        self.start = maze.find('A')
+        self.goal = maze.find('B')
+        if self.start is None or self.goal is None:
+            return None
+        width = maze.width
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+
+        with open(os.path.join(tmp, "layers.bin"), "w+b") as layers, \
+                open(os.path.join(tmp, "starts.bin"), "w+b") as starts, \
+                open(os.path.join(tmp, "runs.bin"), "w+b") as scratch:
+            # Record d of starts is the first record of layer d in layers
+            array('q', [0, 1]).tofile(starts)
+            array('q', [start]).tofile(layers)
+            layers.flush()
+            depth, before, first, last = 0, 0, 0, 1
+            found = start == goal
+            # Nearest cell to the goal seen so far, tracked when bounded
+            bounded = stop_at is not None or max_expansions is not None
+            gy, gx = self.goal
+            closest = (abs(self.start[0] - gy) + abs(self.start[1] - gx), start, 0)
+            stopped = None
+
+            while not found and first < last:
+                if max_expansions is not None and self.num_explored >= max_expansions:
+                    stopped = "max_expansions"
+                    break
+                if stop_at is not None and time.perf_counter() >= stop_at:
+                    stopped = "deadline"
+                    break
+                self.num_explored += last - first
+
+                scratch.seek(0)
+                scratch.truncate()
+                runs = self.spill_neighbors(maze, layers, first, last - first, scratch)
+                seen = read_records(layers, first, last - first)
+                if depth:
+                    seen = heapq.merge(read_records(layers, before, first - before), seen)
+
+                count = 0
+                chunk = array('q')
+                for cell in self.difference(scratch, runs, seen):
+                    chunk.append(cell)
+                    if cell == goal:
+                        found = True
+                    if bounded:
+                        y, x = divmod(cell, width)
+                        distance = abs(y - gy) + abs(x - gx)
+                        if distance < closest[0]:
+                            closest = (distance, cell, depth + 1)
+                    if len(chunk) >= self.run_size:
+                        chunk.tofile(layers)
+                        count += len(chunk)
+                        chunk = array('q')
+                chunk.tofile(layers)
+                count += len(chunk)
+                layers.flush()
+                array('q', [last + count]).tofile(starts)
+                depth, before, first, last = depth + 1, first, last, last + count
+
+            starts.flush()
+            self.stats = {"explored": self.num_explored, "frontier": 0, "stopped": stopped}
+            if stopped is not None:
+                self.partial = True
+                self.stats["frontier"] = last - first
+                self.stats["closest"] = divmod(closest[1], width)
+                self.stats["estimate"] = closest[0]
+                return self.backtrack(maze, layers, starts, closest[2], closest[1])
+            if not found:
+                return None
+            return self.backtrack(maze, layers, starts, depth, goal)
+
+    def spill_neighbors(self, maze, layers, first, count, scratch):
+        """Appends the neighbours of a layer to `scratch` as sorted runs;
+        returns their (start record, count) pairs."""
+        runs = []
+        buffer = []
+
+        def spill():
+            run = array('q', sorted(set(buffer)))
+            runs.append((scratch.tell() // RECORD, len(run)))
+            run.tofile(scratch)
+            buffer.clear()
+
+        free_neighbors = maze.free_neighbors
+        for cell in read_records(layers, first, count):
+            buffer.extend(free_neighbors(cell))
+            if len(buffer) >= self.run_size:
+                spill()
+        if buffer:
+            spill()
+        scratch.flush()
+        return runs
+
+    @staticmethod
+    def difference(scratch, runs, seen):
+        """Merges sorted runs, dropping duplicates and anything in `seen`."""
+        merged = heapq.merge(*(read_records(scratch, start, count) for start, count in runs))
+        seen = iter(seen)
+        skip = next(seen, None)
+        last = None
+        for cell in merged:
+            if cell == last:
+                continue
+            last = cell
+            while skip is not None and skip < cell:
+                skip = next(seen, None)
+            if cell != skip:
+                yield cell
+
+    def output_image(self, filename=None):
+        """Renders the maze file and solution; this reads the whole file, so
+        it is only meant for mazes that fit in memory."""
+        with open(self.filename, "rb") as f:
+            # Columns are bytes, as in MazeFile
+            maze = [line.rstrip(b"\r\n").decode("latin-1") for line in f]
+        draw_solution(filename or self.image_name, maze, self.start, self.goal, self.solution)
+
+    @staticmethod
+    def backtrack(maze, layers, starts, depth, goal):
+        """Walks back from `goal` (any cell in layer `depth`) to the start."""
+        width = maze.width
+        path = [goal]
+        current = goal
+        for depth in range(depth - 1, -1, -1):
+            first, last = read_records(starts, depth, 2)
+            for neighbor in maze.free_neighbors(current):
+                if contains_record(layers, first, last - first, neighbor):
+                    current = neighbor
+                    break
+            path.append(current)
+        path.reverse()
+        return [divmod(cell, width) for cell in path]
+
+
+if __name__ == "__main__":
+    solver = MazeSolverExternalBFS("complex_maze.txt")
+    solver.solve()
@@ -0,0 +1,104 @@
+import heapq
+from collections import deque
+
+
+class QueueFrontier:
+    """First in, first out. Priorities are ignored."""
+
+    def __init__(self):
+        self.queue = deque()
+
+    def push(self, priority, item, tie=0):
+        self.queue.append(item)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def __len__(self):
+        return len(self.queue)
+
+
+class StackFrontier:
+    """Last in, first out. Priorities are ignored."""
+
+    def __init__(self):
+        self.stack = []
+
+    def push(self, priority, item, tie=0):
+        self.stack.append(item)
+
+    def pop(self):
+        return self.stack.pop()
+
+    def __len__(self):
+        return len(self.stack)
+
+
+class HeapFrontier:
+    """Binary heap priority queue. Equal priorities pop the larger tie first."""
+
+    def __init__(self):
+        self.heap = []
+
+    def push(self, priority, item, tie=0):
+        heapq.heappush(self.heap, (priority, -tie, item))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class BucketFrontier:
+    """Dial's bucket queue for small non-negative integer priorities.
+
+    Push and pop are O(1) amortized: every priority has a plain list used
+    as a stack, and a cursor walks forward to the lowest non-empty one.
+    `tie` is ignored; popping the latest push first already prefers deeper
+    nodes (larger g) on equal f in A*.
+    """
+
+    def __init__(self):
+        self.buckets = []
+        self.cursor = 0
+        self.size = 0
+
+    def push(self, priority, item, tie=0):
+        buckets = self.buckets
+        if priority >= len(buckets):
+            buckets.extend([] for _ in range(priority + 1 - len(buckets)))
+        buckets[priority].append(item)
+        # Priorities need not be monotone (GBFS), so step the cursor back
+        if priority < self.cursor:
+            self.cursor = priority
+        self.size += 1
+
+    def pop(self):
+        if not self.size:
+            raise IndexError("pop from empty frontier")
+        buckets = self.buckets
+        cursor = self.cursor
+        while not buckets[cursor]:
+            cursor += 1
+        self.cursor = cursor
+        self.size -= 1
+        return buckets[cursor].pop()
+
+    def __len__(self):
+        return self.size
+
+
+FRONTIERS = {
+    "queue": QueueFrontier,
+    "stack": StackFrontier,
+    "heap": HeapFrontier,
+    "bucket": BucketFrontier,
+}
+
+
+def frontier_class(name):
+    try:
+        return FRONTIERS[name]
+    except KeyError:
+        raise ValueError(f"unknown frontier {name!r}, expected one of {sorted(FRONTIERS)}")
@@ -0,0 +1,85 @@
+import random
+
+
+# Every generator carves a perfect maze on a width x height grid of walls.
+# Cells sit at odd coordinates and the passages between them at one odd and
+# one even coordinate; all randomness comes from the `rng` passed in, so a
+# maze is reproducible from its seed.
+
+def backtracker(width, height, rng):
+    """Recursive backtracker (randomized DFS), run with an explicit stack."""
+    maze = [['#'] * width for _ in range(height)]
+    maze[1][1] = ' '
+    stack = [(1, 1)]
+    directions = [(-2, 0), (2, 0), (0, -2), (0, 2)]
+    while stack:
+        y, x = stack[-1]
+        options = [(dy, dx) for dy, dx in directions
+                   if 0 < y + dy < height - 1 and 0 < x + dx < width - 1 and maze[y + dy][x + dx] == '#']
+        if not options:
+            stack.pop()
+            continue
+        dy, dx = rng.choice(options)
+        maze[y + dy // 2][x + dx // 2] = ' '
+        maze[y + dy][x + dx] = ' '
+        stack.append((y + dy, x + dx))
+    return maze
+
+
+def binary_tree(width, height, rng):
+    """Each cell carves north or east; one random bit per cell, drawn a row at a time."""
+    maze = [['#'] * width for _ in range(height)]
+    columns = range(1, width - 1, 2)
+    last = columns[-1]
+    for y in range(1, height - 1, 2):
+        row, above = maze[y], maze[y - 1]
+        bits = rng.getrandbits(len(columns))
+        for i, x in enumerate(columns):
+            row[x] = ' '
+            north = y > 1 and (x == last or bits >> i & 1)
+            if north:
+                above[x] = ' '
+            elif x != last:
+                row[x + 1] = ' '
+    return maze
+
+
+def sidewinder(width, height, rng):
+    """Rows of east-going runs, each closed by one passage north from a random run cell."""
+    maze = [['#'] * width for _ in range(height)]
+    columns = range(1, width - 1, 2)
+    last = columns[-1]
+    for y in range(1, height - 1, 2):
+        row, above = maze[y], maze[y - 1]
+        bits = rng.getrandbits(len(columns))
+        run_start = columns[0]
+        for i, x in enumerate(columns):
+            row[x] = ' '
+            if y > 1 and (x == last or bits >> i & 1):
+                above[rng.randrange(run_start, x + 1, 2)] = ' '
+                run_start = x + 2
+            elif x != last:
+                row[x + 1] = ' '
+    return maze
+
+
+GENERATORS = {
+    "backtracker": backtracker,
+    "binary_tree": binary_tree,
+    "sidewinder": sidewinder,
+}
+
+
+def generate(width, height, algorithm="backtracker", seed=None):
+    """Returns a maze as a list of row lists with A top-left and B bottom-right.
+
+    Even sizes are rounded up to the next odd size so that the border is
+    solid and the goal lands on a cell.
+    """
+    width, height = width | 1, height | 1
+    if width < 3 or height < 3:
+        raise ValueError("maze must be at least 3x3")
+    maze = GENERATORS[algorithm](width, height, random.Random(seed))
+    maze[1][1] = 'A'
+    maze[height - 2][width - 2] = 'B'
+    return maze
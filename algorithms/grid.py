@@ -0,0 +1,67 @@
+from array import array
+
+
+class Grid:
+    """Adjacency of a character maze, built once in CSR form.
+
+    Cells are numbered row by row (index = y * width + x). The free
+    neighbours of cell i are targets[offsets[i]:offsets[i + 1]], listed
+    right, down, left, up. Walls and cells past the end of a short row
+    have no neighbours.
+
+    codes[k] is the 2-bit direction of the move to targets[k] (0 right,
+    1 down, 2 left, 3 up); stepping back from a cell entered with code c
+    subtracts deltas[c] from its index.
+    """
+
+    def __init__(self, maze):
+        self.height = height = len(maze)
+        self.width = width = max((len(row) for row in maze), default=0)
+        self.size = size = height * width
+
+        free = bytearray(size)
+        for y, row in enumerate(maze):
+            base = y * width
+            for x, col in enumerate(row):
+                if col != '#':
+                    free[base + x] = 1
+        self.free = free
+
+        offsets = array('i', [0]) * (size + 1)
+        targets = array('i')
+        codes = bytearray()
+        append = targets.append
+        code = codes.append
+        last_row = size - width
+        i = 0
+        for y in range(height):
+            for x in range(width):
+                if free[i]:
+                    if x + 1 < width and free[i + 1]:
+                        append(i + 1)
+                        code(0)
+                    if i < last_row and free[i + width]:
+                        append(i + width)
+                        code(1)
+                    if x and free[i - 1]:
+                        append(i - 1)
+                        code(2)
+                    if i >= width and free[i - width]:
+                        append(i - width)
+                        code(3)
+                i += 1
+                offsets[i] = len(targets)
+        self.offsets = offsets
+        self.targets = targets
+        self.codes = codes
+        self.deltas = (1, width, -1, -width)
+
+    def index(self, position):
+        y, x = position
+        return y * self.width + x
+
+    def position(self, index):
+        return divmod(index, self.width)
+
+    def neighbors(self, index):
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
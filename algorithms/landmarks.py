@@ -0,0 +1,117 @@
+import hashlib
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"MZLM"
+VERSION = 1
+HEADER = struct.Struct("<4sIIII32s")
+
+
+def bfs_distances(grid, source):
+    """Exact step distance from `source` to every cell; -1 where unreachable."""
+    offsets, targets = grid.offsets, grid.targets
+    dist = array('i', [-1]) * grid.size
+    dist[source] = 0
+    layer = [source]
+    depth = 0
+    while layer:
+        depth += 1
+        next_layer = []
+        for cell in layer:
+            for k in range(offsets[cell], offsets[cell + 1]):
+                neighbor = targets[k]
+                if dist[neighbor] < 0:
+                    dist[neighbor] = depth
+                    next_layer.append(neighbor)
+        layer = next_layer
+    return dist
+
+
+def grid_digest(grid):
+    return hashlib.blake2b(bytes(grid.free) + struct.pack("<II", grid.width, grid.height),
+                           digest_size=32).digest()
+
+
+class LandmarkIndex:
+    """Distance tables from K landmarks for the ALT lower bound.
+
+    For any cells a and b and landmark L, |d(L, a) - d(L, b)| <= d(a, b) by
+    the triangle inequality, so the maximum over landmarks is an admissible
+    and consistent A* heuristic. Landmarks are picked by farthest-point
+    sampling, which puts them on the periphery where the bound is tightest.
+    """
+
+    def __init__(self, landmarks, tables):
+        self.landmarks = landmarks
+        self.tables = tables
+
+    @classmethod
+    def build(cls, grid, count=8, seed=None):
+        if seed is None:
+            seed = next((i for i in range(grid.size) if grid.free[i]), None)
+        if seed is None:
+            return cls(array('i'), [])
+        # Farthest-point sampling: each landmark is the cell farthest from
+        # all landmarks chosen so far (the first, farthest from `seed`).
+        nearest = bfs_distances(grid, seed)
+        landmarks, tables = array('i'), []
+        for _ in range(count):
+            farthest = max(nearest)
+            if farthest <= 0:
+                break
+            landmark = nearest.index(farthest)
+            table = bfs_distances(grid, landmark)
+            landmarks.append(landmark)
+            tables.append(table)
+            nearest = table if len(tables) == 1 else array('i', map(min, nearest, table))
+        return cls(landmarks, tables)
+
+    def goal_bounds(self, goal):
+        """(table, distance from landmark to goal) pairs usable for `goal`."""
+        return [(table, table[goal]) for table in self.tables if table[goal] >= 0]
+
+    def save(self, filename, grid):
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, grid.width, grid.height, len(self.tables), grid_digest(grid)))
+            for values in (self.landmarks, *self.tables):
+                if sys.byteorder == "big":
+                    values = array('i', values)
+                    values.byteswap()
+                values.tofile(f)
+
+    @classmethod
+    def load(cls, filename, grid):
+        """Reads tables saved for this exact grid; None if missing or stale."""
+        try:
+            with open(filename, "rb") as f:
+                magic, version, width, height, count, digest = HEADER.unpack(f.read(HEADER.size))
+                if (magic, version, width, height) != (MAGIC, VERSION, grid.width, grid.height) \
+                        or digest != grid_digest(grid):
+                    return None
+                arrays = []
+                for size in (count,) + (grid.size,) * count:
+                    values = array('i')
+                    values.fromfile(f, size)
+                    if sys.byteorder == "big":
+                        values.byteswap()
+                    arrays.append(values)
+        except (OSError, EOFError, struct.error):
+            return None
+        return cls(arrays[0], arrays[1:])
+
+    @classmethod
+    def for_maze(cls, filename, grid, count=8):
+        """Loads `<maze>.landmarks` next to the maze, building and saving it
+        if it is missing, stale or has fewer than `count` landmarks."""
+        path = filename + ".landmarks"
+        index = cls.load(path, grid)
+        if index is None or len(index.tables) < count:
+            index = cls.build(grid, count)
+            try:
+                index.save(path, grid)
+            except OSError:
+                if os.path.exists(path):
+                    os.remove(path)
+        return index
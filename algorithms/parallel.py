@@ -0,0 +1,318 @@
+import multiprocessing
+import os
+import time
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+from algorithms.components import ComponentIndex
+from algorithms.grid import Grid
+from algorithms.search import draw_solution
+
+
+def strip_bounds(height, workers):
+    """Splits rows into `workers` contiguous strips; returns their first rows."""
+    rows = -(-height // workers)
+    return [min(i * rows, height) for i in range(workers + 1)]
+
+
+def _strip_worker(conn):
+    """Serves searches for one strip until it receives None. An "attach"
+    message points it at a search's shared memory and strip; each
+    (level, incoming) message then expands one level."""
+    walls_shm = dist_shm = None
+    free = dist = None
+    frontier = []
+
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            if message[0] == "attach":
+                _, walls_name, dist_name, width, height, bounds, strip, goal = message
+                if walls_shm is None or (walls_shm.name, dist_shm.name) != (walls_name, dist_name):
+                    if walls_shm is not None:
+                        dist.release()
+                        walls_shm.close()
+                        dist_shm.close()
+                    walls_shm = shared_memory.SharedMemory(name=walls_name)
+                    dist_shm = shared_memory.SharedMemory(name=dist_name)
+                    free = walls_shm.buf
+                    dist = dist_shm.buf.cast('i')
+                first, last = bounds[strip] * width, bounds[strip + 1] * width
+                strip_rows = bounds[1] - bounds[0]
+                size = width * height
+                frontier = []
+                continue
+            level, incoming = message
+
+            # Cells other strips reached last level are claimed here, since
+            # only the owning strip writes its part of the distance array.
+            for cell in incoming:
+                if dist[cell] < 0:
+                    dist[cell] = level
+                    frontier.append(cell)
+
+            expanded = len(frontier)
+            next_level = level + 1
+            local = []
+            outgoing = {}
+            # With a goal, also report the expanded cell nearest to it
+            closest = None
+            if goal is not None:
+                gy, gx = divmod(goal, width)
+                for cell in frontier:
+                    y, x = divmod(cell, width)
+                    distance = abs(y - gy) + abs(x - gx)
+                    if closest is None or distance < closest[0]:
+                        closest = (distance, cell)
+            for cell in frontier:
+                x = cell % width
+                for neighbor in (cell + 1 if x + 1 < width else -1, cell + width,
+                                 cell - 1 if x else -1, cell - width):
+                    if neighbor < 0 or neighbor >= size or not free[neighbor] or dist[neighbor] >= 0:
+                        continue
+                    if first <= neighbor < last:
+                        dist[neighbor] = next_level
+                        local.append(neighbor)
+                    else:
+                        outgoing.setdefault(neighbor // width // strip_rows, set()).add(neighbor)
+            frontier = local
+            conn.send(({owner: list(cells) for owner, cells in outgoing.items()}, expanded, len(local), closest))
+    finally:
+        if walls_shm is not None:
+            del free
+            dist.release()
+            walls_shm.close()
+            dist_shm.close()
+        conn.close()
+
+
+class StripPool:
+    """Strip worker processes kept alive between searches, so a search
+    costs one message per worker to start rather than a process each."""
+
+    def __init__(self, workers):
+        self.pid = os.getpid()
+        # Workers must share this process's resource tracker: one of their
+        # own would unlink every block they attached to when they exit.
+        resource_tracker.ensure_running()
+        self.processes, self.pipes = [], []
+        for _ in range(workers):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_strip_worker, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self.processes.append(process)
+            self.pipes.append(parent)
+
+    def terminate(self):
+        """Stops workers that may be mid-level, e.g. after an interrupted search."""
+        for process in self.processes:
+            process.terminate()
+        for pipe in self.pipes:
+            pipe.close()
+        for process in self.processes:
+            process.join()
+
+
+# Pools by worker count, shared by every solver in this process
+_pools = {}
+
+
+def strip_pool(workers):
+    """The StripPool of `workers` processes for this process, started on
+    first use. A forked child starts its own rather than sharing pipes
+    with its parent's workers."""
+    pool = _pools.get(workers)
+    if pool is None or pool.pid != os.getpid():
+        pool = _pools[workers] = StripPool(workers)
+    return pool
+
+
+def _unlink(*blocks):
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
+
+
+class MazeSolverParallelBFS:
+    """Level-synchronous BFS spread over worker processes.
+
+    The open-cell mask and an int32 distance array live in shared memory.
+    Each worker owns a horizontal strip of rows and keeps its own frontier;
+    per level it expands that frontier, writes distances only inside its
+    strip and returns the cells it reached in other strips, which the
+    parent routes to their owners for the next level. Only those boundary
+    cells cross process boundaries. The path is read back from the
+    distance array. Pays off on grids whose BFS levels are wide; a long
+    single corridor still costs one round trip per level.
+
+    The workers (see strip_pool) start with the first solve in a process
+    and serve every solver after it; a solver's shared memory is kept
+    between its solves until close(). Deadlines count from once the
+    workers are up.
+    """
+
+    name = "parallel BFS"
+    image_name = "parallel_solution.png"
+
+    def __init__(self, filename, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.blocks = None
+        self.load_maze(filename)
+
+    def load_maze(self, filename):
+        with open(filename) as f:
+            self.maze = [list(line.strip()) for line in f.readlines()]
+        self.start = self.find_position('A')
+        self.goal = self.find_position('B')
+        self.components = None
+        self.index_walls()
+
+    def index_walls(self):
+        """Builds the open-cell mask from self.maze; it is copied to shared
+        memory on the next search."""
+        self.close()
+        self.height = len(self.maze)
+        self.width = max((len(row) for row in self.maze), default=0)
+        text = ''.join(''.join(row).ljust(self.width, '#') for row in self.maze)
+        self.free = text.translate({ord(c): 0 if c == '#' else 1 for c in set(text)}).encode("latin-1")
+
+    def index_components(self):
+        """Labels connected regions once, as MazeSolver.index_components
+        does, so that a goal the start cannot reach costs no workers."""
+        self.components = ComponentIndex(Grid(self.maze))
+        return self.components
+
+    def close(self):
+        """Frees this solver's shared memory; the worker pool stays up."""
+        if self.blocks is not None:
+            self.unlink()
+            self.blocks = None
+
+    def find_position(self, char):
+        for y, row in enumerate(self.maze):
+            for x, col in enumerate(row):
+                if col == char:
+                    return (y, x)
+        return None
+
+    def solve(self, deadline=None, max_expansions=None):
+        """Solves the maze. `deadline` (seconds) and `max_expansions` bound
+        the search as in MazeSolver.solve, checked between levels."""
+        strip_pool(self.workers)
+        start_time = time.perf_counter()
+        stop_at = None if deadline is None else start_time + deadline
+        self.solution = self.search(stop_at, max_expansions)
+        end_time = time.perf_counter()
+        print(f"Time taken by {self.name}: {(end_time - start_time) * 1_000_000:.2f} µs")
+        return self.solution
+
+    def search(self, stop_at=None, max_expansions=None):
+        self.num_explored = 0
+        self.partial = False
+        self.stats = {"explored": 0, "frontier": 0, "stopped": None}
+        if self.start is None or self.goal is None:
+            return None
+        height, width = self.height, self.width
+        if self.components is not None and not self.components.connected(
+                self.start[0] * width + self.start[1], self.goal[0] * width + self.goal[1]):
+            return None
+        size = width * height
+        workers = max(1, min(self.workers, height))
+        bounds = strip_bounds(height, workers)
+        strip_rows = bounds[1] - bounds[0]
+
+        if self.blocks is None:
+            self.blocks = (shared_memory.SharedMemory(create=True, size=max(size, 1)),
+                           shared_memory.SharedMemory(create=True, size=max(4 * size, 4)))
+            # Unlinked by close(), or when the solver is garbage collected
+            self.unlink = weakref.finalize(self, _unlink, *self.blocks)
+            self.blocks[0].buf[:size] = self.free
+        walls_shm, dist_shm = self.blocks
+        dist_shm.buf[:4 * size] = b'\xff' * (4 * size)
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+        bounded = stop_at is not None or max_expansions is not None
+
+        pool = strip_pool(self.workers)
+        pipes = pool.pipes[:workers]
+        dist = dist_shm.buf.cast('i')
+        try:
+            for strip, pipe in enumerate(pipes):
+                pipe.send(("attach", walls_shm.name, dist_shm.name, width, height, bounds, strip,
+                           goal if bounded else None))
+            incoming = [[] for _ in range(workers)]
+            incoming[start // width // strip_rows].append(start)
+            level = 0
+            active = 1
+            stopped = None
+            closest = (abs(self.start[0] - self.goal[0]) + abs(self.start[1] - self.goal[1]), start)
+            while True:
+                if max_expansions is not None and self.num_explored >= max_expansions:
+                    stopped = "max_expansions"
+                    break
+                if stop_at is not None and time.perf_counter() >= stop_at:
+                    stopped = "deadline"
+                    break
+                for pipe, cells in zip(pipes, incoming):
+                    pipe.send((level, cells))
+                incoming = [[] for _ in range(workers)]
+                active = 0
+                for pipe in pipes:
+                    outgoing, expanded, count, nearest = pipe.recv()
+                    self.num_explored += expanded
+                    active += count
+                    if nearest is not None and nearest < closest:
+                        closest = nearest
+                    for owner, cells in outgoing.items():
+                        incoming[owner].extend(cells)
+                        active += len(cells)
+                if dist[goal] >= 0 or not active:
+                    break
+                level += 1
+
+            self.stats = {"explored": self.num_explored, "frontier": 0, "stopped": stopped}
+            if stopped is not None:
+                self.partial = True
+                self.stats["frontier"] = active
+                self.stats["closest"] = divmod(closest[1], width)
+                self.stats["estimate"] = closest[0]
+                if not level:
+                    # Stopped before the first level: nothing has a distance yet
+                    return [self.start]
+                return self.backtrack(dist, width, height, closest[1])
+            return self.backtrack(dist, width, height, goal) if dist[goal] >= 0 else None
+        except BaseException:
+            # Workers may still be mid-level; start a fresh pool next time
+            if _pools.get(self.workers) is pool:
+                del _pools[self.workers]
+            pool.terminate()
+            raise
+        finally:
+            dist.release()
+
+    def output_image(self, filename=None):
+        draw_solution(filename or self.image_name, self.maze, self.start, self.goal, self.solution)
+
+    @staticmethod
+    def backtrack(dist, width, height, goal):
+        path = [goal]
+        current = goal
+        size = width * height
+        while dist[current]:
+            x = current % width
+            for neighbor in (current + 1 if x + 1 < width else -1, current + width,
+                             current - 1 if x else -1, current - width):
+                if 0 <= neighbor < size and dist[neighbor] == dist[current] - 1:
+                    current = neighbor
+                    break
+            path.append(current)
+        path.reverse()
+        return [divmod(cell, width) for cell in path]
+
+
+if __name__ == "__main__":
+    solver = MazeSolverParallelBFS("complex_maze.txt")
+    solver.solve()
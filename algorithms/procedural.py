@@ -0,0 +1,133 @@
+import hashlib
+import random
+from collections import OrderedDict
+
+from algorithms.generators import GENERATORS
+
+
+class MazeSource:
+    """Walls of a maze computed on demand rather than read from a file.
+
+    Solvers built with MazeSolver.from_source only call is_free and
+    neighbors, so a source can describe a map far larger than memory.
+    Subclasses implement is_free.
+    """
+
+    def is_free(self, position):
+        raise NotImplementedError
+
+    def neighbors(self, position):
+        """Free cells next to `position`, listed right, down, left, up."""
+        y, x = position
+        is_free = self.is_free
+        return [cell for cell in ((y, x + 1), (y + 1, x), (y, x - 1), (y - 1, x)) if is_free(cell)]
+
+    def region(self, top, left, height, width):
+        """Rows of '#' and ' ' for a window of the map, e.g. for rendering."""
+        return [''.join(' ' if self.is_free((y, x)) else '#' for x in range(left, left + width))
+                for y in range(top, top + height)]
+
+
+class ChunkedMaze(MazeSource):
+    """A maze of perfect-maze chunks generated from a seed.
+
+    The plane is tiled with chunk_size x chunk_size chunks. Chunk (cy, cx)
+    is carved by one of algorithms.generators' GENERATORS using an RNG
+    seeded from (seed, cy, cx), and owns its top and left wall lines, each
+    opened by one door to the neighbouring chunk. Every chunk is connected inside and
+    to its neighbours, so the whole map is one connected region, and any
+    cell can be computed without looking at any other chunk.
+
+    Chunks are cached with LRU eviction, so memory stays proportional to
+    the region a search touches. With `extent` = (rows, columns) only that
+    many chunks are open, from (0, 0); otherwise the map has no edge.
+    Cells sit at odd coordinates, as in algorithms.generators.
+    """
+
+    def __init__(self, seed, chunk_size=32, cache_size=256, algorithm="backtracker", extent=None):
+        if chunk_size < 4 or chunk_size % 2:
+            raise ValueError("chunk_size must be an even number of at least 4")
+        if algorithm not in GENERATORS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {sorted(GENERATORS)}")
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.algorithm = algorithm
+        self.extent = extent
+        self.generated = 0
+        self._chunks = OrderedDict()
+        self._last_key = self._last_chunk = None
+
+    def chunk(self, cy, cx):
+        """Free flags of chunk (cy, cx), row by row."""
+        key = (cy, cx)
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            chunk = self._chunks[key] = self.generate_chunk(cy, cx)
+            if len(self._chunks) > self.cache_size:
+                self._chunks.popitem(last=False)
+        else:
+            self._chunks.move_to_end(key)
+        return chunk
+
+    def generate_chunk(self, cy, cx):
+        size = self.chunk_size
+        free = bytearray(size * size)
+        if self.extent is not None and not (0 <= cy < self.extent[0] and 0 <= cx < self.extent[1]):
+            return free
+        self.generated += 1
+        digest = hashlib.blake2b(f"{self.seed}:{cy}:{cx}".encode(), digest_size=8).digest()
+        rng = random.Random(int.from_bytes(digest, "little"))
+        # Carve (size + 1)^2 with solid borders and keep the top-left size^2:
+        # the bottom and right wall lines belong to the next chunks.
+        maze = GENERATORS[self.algorithm](size + 1, size + 1, rng)
+        for y in range(size):
+            row, base = maze[y], y * size
+            for x in range(size):
+                if row[x] != '#':
+                    free[base + x] = 1
+        if self.extent is None or cy > 0:
+            free[rng.randrange(1, size, 2)] = 1
+        if self.extent is None or cx > 0:
+            free[rng.randrange(1, size, 2) * size] = 1
+        return free
+
+    def _chunk_of(self, y, x):
+        key = (y // self.chunk_size, x // self.chunk_size)
+        if key != self._last_key:
+            self._last_chunk = self.chunk(*key)
+            self._last_key = key
+        return self._last_chunk
+
+    def is_free(self, position):
+        y, x = position
+        size = self.chunk_size
+        return self._chunk_of(y, x)[y % size * size + x % size] == 1
+
+    def neighbors(self, position):
+        # Neighbours inside the same chunk are read directly; only moves
+        # across a chunk edge go through is_free.
+        y, x = position
+        size = self.chunk_size
+        chunk = self._chunk_of(y, x)
+        ly, lx = y % size, x % size
+        i = ly * size + lx
+        cells = []
+        if chunk[i + 1] if lx + 1 < size else self.is_free((y, x + 1)):
+            cells.append((y, x + 1))
+        if chunk[i + size] if ly + 1 < size else self.is_free((y + 1, x)):
+            cells.append((y + 1, x))
+        if chunk[i - 1] if lx else self.is_free((y, x - 1)):
+            cells.append((y, x - 1))
+        if chunk[i - size] if ly else self.is_free((y - 1, x)):
+            cells.append((y - 1, x))
+        return cells
+
+
+if __name__ == "__main__":
+    from algorithms.astar import MazeSolverAStar
+
+    source = ChunkedMaze(seed=1)
+    solver = MazeSolverAStar.from_source(source, (1, 1), (301, 301))
+    path = solver.solve()
+    print(f"Path length: {len(path)}, chunks generated: {source.generated}")
@@ -0,0 +1,416 @@
+import sys
+import time
+from array import array
+from collections import namedtuple
+
+from algorithms.components import ComponentIndex
+from algorithms.frontier import frontier_class
+from algorithms.grid import Grid
+from algorithms.state import SearchState
+
+
+# One batch of streamed search events: flat indices of the cells expanded
+# and pushed since the previous batch, in order (see Grid.position).
+SearchEvents = namedtuple("SearchEvents", ["expanded", "pushed"])
+
+CHECK_INTERVAL = 256
+
+
+def check_budget(stop_at, max_expansions, explored):
+    """For a search `explored` expansions in: what stopped it ("deadline",
+    "max_expansions" or None) and, if nothing did, the expansion count at
+    which to check again. `stop_at` is a time.perf_counter() value."""
+    if max_expansions is not None and explored >= max_expansions:
+        return "max_expansions", explored
+    if stop_at is not None and time.perf_counter() >= stop_at:
+        return "deadline", explored
+    next_check = explored + CHECK_INTERVAL
+    if max_expansions is not None and next_check > max_expansions:
+        next_check = max_expansions
+    return None, next_check
+
+
+class MazeSolver:
+    """Shared loading, search loop and rendering for the solvers in algorithms/.
+
+    Subclasses choose the frontier and, for priority frontiers, how cells
+    are ranked:
+
+    - ``frontier``: default frontier name (see ``algorithms.frontier``)
+    - ``priority(index, cost)``: rank of a cell reached at ``cost`` steps,
+      or None when the frontier ignores priorities
+    - ``relax``: re-open cells when a cheaper path to them is found (UCS,
+      A*); otherwise each cell is pushed at most once
+    - ``prepare(start, goal)``: called with the flat start and goal indices
+      before each search, to precompute per-query data for ``priority``
+    - ``position_priority(position, cost)``: ``priority`` for solvers built
+      with ``from_source``, which have (y, x) positions but no flat indices
+    """
+
+    name = "search"
+    frontier = "queue"
+    relax = False
+    priority = None
+    image_name = "solution.png"
+
+    def __init__(self, filename, frontier=None):
+        self.frontier_class = frontier_class(frontier or self.frontier)
+        self.load_maze(filename)
+
+    @classmethod
+    def from_source(cls, source, start, goal, frontier=None):
+        """Solver over a MazeSource (see algorithms.procedural) instead of a
+        maze file. Searches keep per-cell state in dicts keyed by (y, x), so
+        memory follows the cells touched rather than the size of the map."""
+        solver = cls.__new__(cls)
+        solver.frontier_class = frontier_class(frontier or cls.frontier)
+        solver.filename = solver.maze = solver.grid = None
+        solver.source = source
+        solver.start, solver.goal = tuple(start), tuple(goal)
+        solver.state = solver.components = solver.landmarks = solver.pruned_for = None
+        return solver
+
+    def load_maze(self, filename):
+        self.filename = filename
+        self.source = None
+        with open(filename) as f:
+            self.maze = [list(line.strip()) for line in f.readlines()]
+        self.start = self.find_position('A')
+        self.goal = self.find_position('B')
+        self.grid = Grid(self.maze)
+        self.state = None
+        self.components = None
+        self.landmarks = None
+        # (start, goal) the maze was pruned for by fill_dead_ends, if any
+        self.pruned_for = None
+
+    def find_position(self, char):
+        for y, row in enumerate(self.maze):
+            for x, col in enumerate(row):
+                if col == char:
+                    return (y, x)
+        return None
+
+    def index_components(self):
+        """Labels connected regions once so that searches between cells
+        that cannot reach each other return None without expanding."""
+        self.components = ComponentIndex(self.grid)
+        return self.components
+
+    def index_landmarks(self, count=8):
+        """Loads or builds ALT landmark tables for this maze, kept in a
+        `.landmarks` file beside it (see algorithms.landmarks)."""
+        from algorithms.landmarks import LandmarkIndex
+
+        self.landmarks = LandmarkIndex.for_maze(self.filename, self.grid, count)
+        return self.landmarks
+
+    def neighbors(self, position):
+        if self.grid is None:
+            return self.source.neighbors(position)
+        grid = self.grid
+        return [grid.position(i) for i in grid.neighbors(grid.index(position))]
+
+    def prepare(self, start, goal):
+        pass
+
+    def estimate(self, index):
+        """Heuristic distance from cell `index` to the goal; bounded searches
+        that stop early return the path to the expanded cell minimizing it."""
+        y, x = divmod(index, self.grid.width)
+        return abs(y - self.goal[0]) + abs(x - self.goal[1])
+
+    def solve(self, start=None, goal=None, deadline=None, max_expansions=None):
+        start_time = time.perf_counter()
+        for _ in self.iter_solve(None, start, goal, deadline, max_expansions):
+            pass
+        end_time = time.perf_counter()
+        print(f"Time taken by {self.name}: {(end_time - start_time) * 1_000_000:.2f} µs")
+        return self.solution
+
+    def iter_solve(self, batch_size=1024, start=None, goal=None, deadline=None, max_expansions=None):
+        """Searches lazily, yielding a SearchEvents batch every `batch_size`
+        expansions; self.solution is set once the generator is exhausted.
+        With batch_size=None nothing is recorded or yielded. `start` and
+        `goal` re-target the solver for repeated queries on the same maze.
+
+        `deadline` (seconds of wall time) and `max_expansions` bound the
+        search. If either runs out first, self.partial is set and the
+        solution is the path to the cell judged closest to the goal by
+        estimate(); self.stats says what stopped it.
+        """
+        self.retarget(start, goal)
+        stop_at = None if deadline is None else time.perf_counter() + deadline
+        self.solution = yield from self.search(batch_size, stop_at, max_expansions)
+
+    def retarget(self, start=None, goal=None):
+        """Replaces the start and/or goal read from the maze file.
+
+        Dead-end filling only keeps the paths between the endpoints it was
+        run for, so a pruned maze is reloaded from its file when they
+        change; indexes built on it are dropped with it."""
+        grid = self.grid
+        endpoints = [self.start, self.goal]
+        for i, (name, cell) in enumerate((("start", start), ("goal", goal))):
+            if cell is not None:
+                y, x = cell
+                if grid is not None and not (0 <= y < grid.height and 0 <= x < grid.width):
+                    raise ValueError(f"{name} {tuple(cell)} is outside the {grid.width}x{grid.height} maze")
+                endpoints[i] = (y, x)
+        if self.pruned_for not in (None, tuple(endpoints)):
+            self.load_maze(self.filename)
+        self.start, self.goal = endpoints
+
+    def search(self, batch_size=None, stop_at=None, max_expansions=None):
+        """Runs one search. `stop_at` is a time.perf_counter() value."""
+        if self.grid is None:
+            return (yield from self.search_source(batch_size, stop_at, max_expansions))
+        self.reset_stats()
+        if self.start is None or self.goal is None:
+            return None
+        grid = self.grid
+        offsets, targets, codes = grid.offsets, grid.targets, grid.codes
+        start, goal = grid.index(self.start), grid.index(self.goal)
+        if not (grid.free[start] and grid.free[goal]):
+            return None
+        if self.components is not None and not self.components.connected(start, goal):
+            return None
+        self.prepare(start, goal)
+
+        state = self.state
+        if state is None or state.size != grid.size:
+            state = self.state = SearchState(grid.size)
+        tag = state.begin(costs=self.relax)
+        marks = state.marks
+        marks[start] = tag
+        cost = state.costs if self.relax else None
+        if cost is not None:
+            cost[start] = 0
+        frontier = self.frontier_class()
+        push, pop = frontier.push, frontier.pop
+        priority = self.priority
+
+        record = batch_size is not None
+        if record:
+            expanded, pushed = array('i'), array('i')
+            push = self._recording_push(push, pushed)
+        push(0, start)
+        explored = 0
+
+        # Budgets are checked every CHECK_INTERVAL expansions so that an
+        # unbounded search only pays one comparison per cell.
+        bounded = stop_at is not None or max_expansions is not None
+        next_check = 0 if bounded else sys.maxsize
+        stopped = None
+        closest, closest_estimate = start, self.estimate(start) if bounded else 0
+
+        while frontier:
+            if explored >= next_check:
+                stopped, next_check = check_budget(stop_at, max_expansions, explored)
+                if stopped is not None:
+                    break
+
+            current = pop()
+            explored += 1
+
+            if record:
+                expanded.append(current)
+                if len(expanded) >= batch_size:
+                    yield SearchEvents(expanded, pushed)
+                    expanded, pushed = array('i'), array('i')
+                    push = self._recording_push(frontier.push, pushed)
+
+            if current == goal:
+                break
+            if bounded:
+                h = self.estimate(current)
+                if h < closest_estimate:
+                    closest, closest_estimate = current, h
+
+            if cost is not None:
+                new_cost = cost[current] + 1  # Each step has a cost of 1
+                for k in range(offsets[current], offsets[current + 1]):
+                    neighbor = targets[k]
+                    if marks[neighbor] < tag or new_cost < cost[neighbor]:
+                        cost[neighbor] = new_cost
+                        marks[neighbor] = tag | codes[k]
+                        push(priority(neighbor, new_cost), neighbor, new_cost)
+            elif priority is not None:
+                for k in range(offsets[current], offsets[current + 1]):
+                    neighbor = targets[k]
+                    if marks[neighbor] < tag:
+                        marks[neighbor] = tag | codes[k]
+                        push(priority(neighbor, 0), neighbor)
+            else:
+                for k in range(offsets[current], offsets[current + 1]):
+                    neighbor = targets[k]
+                    if marks[neighbor] < tag:
+                        marks[neighbor] = tag | codes[k]
+                        push(0, neighbor)
+
+        self.record_stats(explored, len(frontier), stopped)
+        if record and (expanded or pushed):
+            yield SearchEvents(expanded, pushed)
+
+        if stopped is not None and (cost is not None or marks[goal] < tag):
+            # Without re-opening, a marked goal already has its final path
+            self.record_partial(grid.position(closest), closest_estimate)
+            return self.walk_back(start, closest)
+        if marks[goal] < tag:
+            return None
+        return self.walk_back(start, goal)
+
+    def walk_back(self, start, end):
+        """Path from `start` to `end` read back from the last search's marks."""
+        grid = self.grid
+        marks, deltas = self.state.marks, grid.deltas
+        path = []
+        current = end
+        while current != start:
+            path.append(grid.position(current))
+            current -= deltas[marks[current] & 3]
+        path.append(grid.position(start))
+        path.reverse()
+        return path
+
+    def search_source(self, batch_size=None, stop_at=None, max_expansions=None):
+        """search() for solvers built with from_source. The same loop, with
+        cells as (y, x) positions, parents and costs in dicts, and
+        neighbours from source.neighbors; SearchEvents carry positions."""
+        self.reset_stats()
+        source, start, goal = self.source, self.start, self.goal
+        if start is None or goal is None or not (source.is_free(start) and source.is_free(goal)):
+            return None
+
+        parents = {start: None}
+        cost = {start: 0} if self.relax else None
+        frontier = self.frontier_class()
+        push, pop = frontier.push, frontier.pop
+        priority = self.position_priority if self.priority is not None else None
+        neighbors = source.neighbors
+
+        record = batch_size is not None
+        if record:
+            expanded, pushed = [], []
+            push = self._recording_push(push, pushed)
+        push(0, start)
+        explored = 0
+
+        bounded = stop_at is not None or max_expansions is not None
+        next_check = 0 if bounded else sys.maxsize
+        stopped = None
+        gy, gx = goal
+        closest, closest_estimate = start, abs(start[0] - gy) + abs(start[1] - gx)
+
+        while frontier:
+            if explored >= next_check:
+                stopped, next_check = check_budget(stop_at, max_expansions, explored)
+                if stopped is not None:
+                    break
+
+            current = pop()
+            explored += 1
+
+            if record:
+                expanded.append(current)
+                if len(expanded) >= batch_size:
+                    yield SearchEvents(expanded, pushed)
+                    expanded, pushed = [], []
+                    push = self._recording_push(frontier.push, pushed)
+
+            if current == goal:
+                break
+            if bounded:
+                h = abs(current[0] - gy) + abs(current[1] - gx)
+                if h < closest_estimate:
+                    closest, closest_estimate = current, h
+
+            if cost is not None:
+                new_cost = cost[current] + 1
+                for neighbor in neighbors(current):
+                    if neighbor not in cost or new_cost < cost[neighbor]:
+                        cost[neighbor] = new_cost
+                        parents[neighbor] = current
+                        push(priority(neighbor, new_cost), neighbor, new_cost)
+            else:
+                for neighbor in neighbors(current):
+                    if neighbor not in parents:
+                        parents[neighbor] = current
+                        push(priority(neighbor, 0) if priority else 0, neighbor)
+
+        self.record_stats(explored, len(frontier), stopped)
+        if record and (expanded or pushed):
+            yield SearchEvents(expanded, pushed)
+
+        end = goal
+        if stopped is not None and (cost is not None or goal not in parents):
+            self.record_partial(closest, closest_estimate)
+            end = closest
+        elif goal not in parents:
+            return None
+        path = []
+        while end is not None:
+            path.append(end)
+            end = parents[end]
+        path.reverse()
+        return path
+
+    def reset_stats(self):
+        self.partial = False
+        self.record_stats(0, 0, None)
+
+    def record_stats(self, explored, frontier, stopped):
+        """Stats of a search after `explored` expansions with `frontier`
+        cells left, stopped early by `stopped` or not (None)."""
+        self.num_explored = explored
+        self.stats = {"explored": explored, "frontier": frontier, "stopped": stopped}
+
+    def record_partial(self, closest, estimate):
+        """Marks the solution as partial, ending at position `closest`."""
+        self.partial = True
+        self.stats["closest"] = closest
+        self.stats["estimate"] = estimate
+
+    @staticmethod
+    def _recording_push(push, pushed):
+        append = pushed.append
+
+        def recording_push(priority, item, tie=0):
+            append(item)
+            push(priority, item, tie)
+        return recording_push
+
+    def output_image(self, filename=None):
+        maze, top, left = self.maze, 0, 0
+        if maze is None:
+            # Procedural source: render the box around the endpoints and path
+            cells = [self.start, self.goal, *(self.solution or ())]
+            top, left = min(y for y, _ in cells) - 1, min(x for _, x in cells) - 1
+            bottom, right = max(y for y, _ in cells) + 1, max(x for _, x in cells) + 1
+            maze = self.source.region(top, left, bottom - top + 1, right - left + 1)
+        draw_solution(filename or self.image_name, maze, self.start, self.goal, self.solution, top, left)
+
+
+def draw_solution(filename, maze, start, goal, solution, top=0, left=0):
+    """Writes `maze` (rows of characters, the first at (top, left)) to an
+    image with the start, goal and solution path marked."""
+    from PIL import Image, ImageDraw
+
+    cell_size = 20
+    solution = set(solution or ())
+    width = max((len(row) for row in maze), default=0)
+    img = Image.new("RGBA", (width * cell_size, len(maze) * cell_size), "black")
+    draw = ImageDraw.Draw(img)
+
+    for y, row in enumerate(maze):
+        for x, col in enumerate(row):
+            color = (255, 255, 255) if col == ' ' else (0, 0, 0)
+            if (top + y, left + x) == start:
+                color = (255, 0, 0)
+            elif (top + y, left + x) == goal:
+                color = (0, 255, 0)
+            if (top + y, left + x) in solution:
+                color = (255, 255, 0)
+            draw.rectangle([x * cell_size, y * cell_size, (x + 1) * cell_size, (y + 1) * cell_size], fill=color)
+
+    img.save(filename)
@@ -0,0 +1,32 @@
+from array import array
+
+
+class SearchState:
+    """Visited and parent marks for one grid, reusable across searches.
+
+    Each cell takes one byte: the search generation in the high six bits and
+    the 2-bit direction code it was entered with (see ``Grid.codes``) in the
+    low two. A cell belongs to the current search iff its byte is at least
+    ``tag``, so a new search only bumps the generation; the bytes are
+    cleared once every 63 searches when the counter wraps. Path costs for
+    UCS/A* live in a parallel int array, allocated on first use and only
+    meaningful for cells marked in the current search.
+    """
+
+    max_generation = 63
+
+    def __init__(self, size):
+        self.size = size
+        self.marks = bytearray(size)
+        self.costs = None
+        self.generation = 0
+
+    def begin(self, costs=False):
+        """Starts a new search and returns its tag (generation << 2)."""
+        self.generation += 1
+        if self.generation > self.max_generation:
+            self.marks[:] = bytes(self.size)
+            self.generation = 1
+        if costs and self.costs is None:
+            self.costs = array('i', bytes(4 * self.size))
+        return self.generation << 2
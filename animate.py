@@ -0,0 +1,300 @@
+import argparse
+import os
+import re
+import struct
+import sys
+import zlib
+
+import numpy as np
+
+from algorithms import SOLVERS, solver_class
+
+WALL, FREE, PUSHED, EXPANDED, PATH, START, GOAL, UNCHANGED = range(8)
+PALETTE = [
+    (0, 0, 0),        # wall
+    (255, 255, 255),  # free
+    (160, 200, 255),  # pushed onto the frontier
+    (60, 110, 200),   # expanded
+    (255, 255, 0),    # solution path
+    (255, 0, 0),      # start
+    (0, 255, 0),      # goal
+    (0, 0, 0),        # GIF only: transparent, i.e. unchanged since the last frame
+]
+
+
+class FrameBuffer:
+    """Palette index of every cell of a grid, plus the bounding box of the
+    cells painted since the last take_dirty(). Painting costs O(cells
+    painted), not O(grid). The start and goal keep their colours."""
+
+    def __init__(self, grid, start=None, goal=None):
+        self.width, self.height = grid.width, grid.height
+        # Grid.free holds 0 for walls and 1 for open cells: WALL and FREE
+        self.cells = np.frombuffer(bytes(grid.free), dtype=np.uint8).reshape(self.height, self.width).copy()
+        self.fixed = []
+        for cell, colour in ((start, START), (goal, GOAL)):
+            if cell is not None:
+                self.fixed.append(grid.index(cell))
+                self.cells[cell] = colour
+        self.dirty = (0, 0, self.height, self.width)
+
+    def paint(self, indices, colour):
+        indices = np.asarray(indices, dtype=np.intp)
+        for index in self.fixed:
+            indices = indices[indices != index]
+        if not len(indices):
+            return
+        self.cells.reshape(-1)[indices] = colour
+        ys, xs = np.divmod(indices, self.width)
+        box = (int(ys.min()), int(xs.min()), int(ys.max()) + 1, int(xs.max()) + 1)
+        if self.dirty is not None:
+            box = (min(box[0], self.dirty[0]), min(box[1], self.dirty[1]),
+                   max(box[2], self.dirty[2]), max(box[3], self.dirty[3]))
+        self.dirty = box
+
+    def take_dirty(self):
+        """(top, left, bottom, right) of the cells changed since the last
+        call, or None if nothing changed."""
+        box, self.dirty = self.dirty, None
+        return box
+
+
+def lzw_encode(data, min_code_size, run_byte=None, min_run=16):
+    """GIF-flavoured LZW: variable-width codes packed LSB first, with a clear
+    code when the 4096-entry table fills up.
+
+    Bytes are matched greedily, one table lookup each, except for runs of
+    at least `min_run` copies of `run_byte`. Those are written with codes
+    this encoder made for runs of that byte, which grow by one per code,
+    so a run of length n takes about sqrt(2n) codes and no per-byte work.
+    Decoders accept any code sequence, so the output is still plain GIF.
+    """
+    clear = 1 << min_code_size
+    end = clear + 1
+    code_size = min_code_size + 1
+    next_code = end + 1
+    table = {}
+    get = table.get
+    runs = [None, run_byte]  # runs[k]: a code for run_byte repeated k times
+    out = bytearray()
+    bits, nbits = clear, code_size
+
+    # (start, end) of bytes to match greedily, then the length of the run
+    segments = []
+    pos = 0
+    if run_byte is not None:
+        for match in re.finditer(re.escape(bytes((run_byte,))) + b"{%d,}" % min_run, data):
+            segments.append((pos, match.start(), match.end() - match.start()))
+            pos = match.end()
+    segments.append((pos, len(data), 0))
+
+    prefix = None
+    prefix_run = 0  # run length of prefix, if it is one of runs
+    for first, last, run in segments:
+        if first < last:
+            prefix_run = 0
+        for byte in data[first:last]:
+            if prefix is None:
+                prefix = byte
+                continue
+            key = prefix << 8 | byte
+            code = get(key)
+            if code is not None:
+                prefix = code
+                continue
+            bits |= prefix << nbits
+            nbits += code_size
+            if next_code < 4096:
+                if next_code == 1 << code_size:
+                    code_size += 1
+                table[key] = next_code
+                next_code += 1
+            else:
+                bits |= clear << nbits
+                nbits += code_size
+                table.clear()
+                del runs[2:]
+                code_size = min_code_size + 1
+                next_code = end + 1
+            while nbits >= 8:
+                out.append(bits & 255)
+                bits >>= 8
+                nbits -= 8
+            prefix = byte
+
+        while run:
+            if prefix is not None:
+                # Emitting prefix before a run_byte adds prefix + run_byte
+                bits |= prefix << nbits
+                nbits += code_size
+                if next_code < 4096:
+                    if next_code == 1 << code_size:
+                        code_size += 1
+                    table.setdefault(prefix << 8 | run_byte, next_code)
+                    if prefix_run and prefix_run + 1 == len(runs):
+                        runs.append(next_code)
+                    next_code += 1
+                else:
+                    bits |= clear << nbits
+                    nbits += code_size
+                    table.clear()
+                    del runs[2:]
+                    code_size = min_code_size + 1
+                    next_code = end + 1
+                while nbits >= 8:
+                    out.append(bits & 255)
+                    bits >>= 8
+                    nbits -= 8
+            prefix_run = min(run, len(runs) - 1)
+            prefix = runs[prefix_run]
+            run -= prefix_run
+
+    if prefix is not None:
+        bits |= prefix << nbits
+        nbits += code_size
+    # The decoder has added one more entry by the time it reads this code
+    if next_code == 1 << code_size and code_size < 12:
+        code_size += 1
+    bits |= end << nbits
+    nbits += code_size
+    while nbits > 0:
+        out.append(bits & 255)
+        bits >>= 8
+        nbits -= 8
+    return bytes(out)
+
+
+class GIFWriter:
+    """Streams frames to an animated GIF as they are produced.
+
+    Each frame is one image covering only the box of cells changed since
+    the previous frame, drawn over it (disposal 1). Inside that box,
+    pixels that did not change are written as the transparent index, so
+    LZW reduces them to a few long codes.
+    """
+
+    def __init__(self, filename, width, height, scale=1, loop=0):
+        self.scale = scale
+        self.previous = np.full((height, width), UNCHANGED, dtype=np.uint8)
+        self.frames = 0
+        self.file = open(filename, "wb")
+        palette = b''.join(bytes(colour) for colour in PALETTE)
+        self.file.write(b"GIF89a" + struct.pack("<HHBBB", width * scale, height * scale, 0xF2, 0, 0) + palette)
+        # NETSCAPE2.0 application extension: repeat `loop` times (0 = forever)
+        self.file.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00")
+
+    def add_frame(self, buffer, box, delay):
+        if box is None:
+            return
+        top, left, bottom, right = box
+        current = buffer.cells[top:bottom, left:right]
+        previous = self.previous[top:bottom, left:right]
+        pixels = np.where(current == previous, UNCHANGED, current).astype(np.uint8)
+        previous[...] = current
+        scale = self.scale
+        if scale > 1:
+            pixels = pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+
+        data = lzw_encode(pixels.tobytes(), 3, UNCHANGED)
+        f = self.file
+        f.write(b"\x21\xf9\x04" + struct.pack("<BHBB", 1 << 2 | 1, round(delay / 10), UNCHANGED, 0))
+        f.write(b"\x2c" + struct.pack("<HHHHB", left * scale, top * scale,
+                                      (right - left) * scale, (bottom - top) * scale, 0) + b"\x03")
+        f.write(b''.join(bytes((len(data[i:i + 255]),)) + data[i:i + 255] for i in range(0, len(data), 255)))
+        f.write(b"\x00")
+        self.frames += 1
+
+    def close(self):
+        self.file.write(b"\x3b")
+        self.file.close()
+
+
+class PNGSequenceWriter:
+    """Writes each frame to `directory` as frame_00000.png, frame_00001.png,
+    ... in 8-bit palette PNG. PNG frames are whole images; delays are
+    ignored."""
+
+    def __init__(self, directory, width, height, scale=1):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.scale = scale
+        self.frames = 0
+        self.header = self.chunk(b"IHDR", struct.pack(">IIBBBBB", width * scale, height * scale, 8, 3, 0, 0, 0))
+        self.header += self.chunk(b"PLTE", b''.join(bytes(colour) for colour in PALETTE[:UNCHANGED]))
+
+    @staticmethod
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    def add_frame(self, buffer, box, delay):
+        if box is None:
+            return
+        pixels = buffer.cells
+        if self.scale > 1:
+            pixels = pixels.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+        # Filter type 0 (none) in front of every row
+        rows = np.zeros((pixels.shape[0], pixels.shape[1] + 1), dtype=np.uint8)
+        rows[:, 1:] = pixels
+        filename = os.path.join(self.directory, f"frame_{self.frames:05d}.png")
+        with open(filename, "wb") as f:
+            f.write(b"\x89PNG\r\n\x1a\n" + self.header)
+            f.write(self.chunk(b"IDAT", zlib.compress(rows.tobytes(), 1)))
+            f.write(self.chunk(b"IEND", b""))
+        self.frames += 1
+
+    def close(self):
+        pass
+
+
+def animate(solver, writer, batch_size, delay=40, final_delay=2000):
+    """Runs solver.iter_solve and writes one frame per SearchEvents batch,
+    then a last frame with the solution path held for `final_delay` ms."""
+    grid = solver.grid
+    if grid is None:
+        raise ValueError("animation needs a maze loaded from a file")
+    buffer = FrameBuffer(grid, solver.start, solver.goal)
+    writer.add_frame(buffer, buffer.take_dirty(), delay)
+    for events in solver.iter_solve(batch_size):
+        buffer.paint(events.pushed, PUSHED)
+        buffer.paint(events.expanded, EXPANDED)
+        writer.add_frame(buffer, buffer.take_dirty(), delay)
+    if solver.solution:
+        buffer.paint([grid.index(cell) for cell in solver.solution], PATH)
+    writer.add_frame(buffer, buffer.take_dirty(), final_delay)
+    return solver.solution
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record how a solver explores a maze.")
+    parser.add_argument("algorithm", choices=sorted(SOLVERS))
+    parser.add_argument("maze", help="maze text file ('#' walls, 'A' start, 'B' goal)")
+    parser.add_argument("output", help="an animated .gif, or a directory for a PNG sequence")
+    parser.add_argument("--frames", type=int, default=150, help="roughly how many frames to record")
+    parser.add_argument("--batch-size", type=int, help="expansions per frame (overrides --frames)")
+    parser.add_argument("--scale", type=int, help="pixels per cell (default: fit about 800 pixels)")
+    parser.add_argument("--delay", type=int, default=40, help="milliseconds per frame (GIF)")
+    parser.add_argument("--final-delay", type=int, default=2000, help="milliseconds to hold the result (GIF)")
+    args = parser.parse_args(argv)
+
+    solver = solver_class(args.algorithm)(args.maze)
+    if not hasattr(solver, "iter_solve"):
+        parser.error(f"{args.algorithm} does not report search progress")
+    grid = solver.grid
+    scale = args.scale or max(1, 800 // max(grid.width, grid.height, 1))
+    batch_size = args.batch_size or max(1, grid.free.count(1) // max(args.frames, 1))
+
+    if args.output.lower().endswith(".gif"):
+        writer = GIFWriter(args.output, grid.width, grid.height, scale)
+    else:
+        writer = PNGSequenceWriter(args.output, grid.width, grid.height, scale)
+    try:
+        path = animate(solver, writer, batch_size, args.delay, args.final_delay)
+    finally:
+        writer.close()
+    print(f"Wrote {writer.frames} frames to {args.output}"
+          + (f" (path length {len(path)})" if path else " (no solution)"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms.generators import GENERATORS, generate
+
+
+def maze_spec(base_seed, index, sizes, algorithms, weights):
+    """Picks size, algorithm and generation seed for maze `index`.
+
+    Derived only from (base_seed, index), so any maze can be regenerated on
+    its own and the corpus does not depend on how work is split up.
+    """
+    digest = hashlib.blake2b(f"{base_seed}:{index}".encode(), digest_size=8).digest()
+    rng = random.Random(int.from_bytes(digest, "little"))
+    width, height = rng.choice(sizes)
+    algorithm = rng.choices(algorithms, weights)[0]
+    return {"id": index, "algorithm": algorithm, "width": width | 1, "height": height | 1,
+            "seed": rng.getrandbits(63)}
+
+
+def write_shard(out, shard, specs):
+    """Generates one shard file; returns its manifest entries."""
+    filename = f"shard-{shard:05d}.txt"
+    entries = []
+    offset = 0
+    with open(os.path.join(out, filename), "wb") as f:
+        for spec in specs:
+            maze = generate(spec["width"], spec["height"], spec["algorithm"], spec["seed"])
+            data = ("\n".join("".join(row) for row in maze) + "\n").encode()
+            f.write(data)
+            f.write(b"\n")
+            entries.append({**spec, "shard": filename, "offset": offset, "length": len(data)})
+            offset += len(data) + 1
+    return entries
+
+
+def parse_size(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height or width)
+
+
+def parse_mix(text):
+    """'backtracker:2,sidewinder' -> (['backtracker', 'sidewinder'], [2.0, 1.0])"""
+    algorithms, weights = [], []
+    for part in text.split(","):
+        name, _, weight = part.partition(":")
+        if name not in GENERATORS:
+            raise argparse.ArgumentTypeError(f"unknown algorithm {name!r}, expected one of {sorted(GENERATORS)}")
+        algorithms.append(name)
+        weights.append(float(weight or 1))
+    return algorithms, weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a reproducible, sharded maze corpus.")
+    parser.add_argument("count", type=int, help="number of mazes")
+    parser.add_argument("--out", default="maze_corpus", help="output directory")
+    parser.add_argument("--sizes", default="35x35", type=lambda s: [parse_size(p) for p in s.split(",")],
+                        help="comma-separated WxH sizes picked uniformly, e.g. 21x21,101x51")
+    parser.add_argument("--algorithms", default="backtracker,binary_tree,sidewinder", type=parse_mix,
+                        help="comma-separated generators with optional weights, e.g. backtracker:2,sidewinder")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument("--shard-size", type=int, default=1000, help="mazes per shard file")
+    parser.add_argument("--workers", type=int, help="generator processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    algorithms, weights = args.algorithms
+    os.makedirs(args.out, exist_ok=True)
+    start_time = time.perf_counter()
+    shards = range(0, args.count, args.shard_size)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool, \
+            open(os.path.join(args.out, "manifest.jsonl"), "w") as manifest:
+        jobs = [
+            pool.submit(write_shard, args.out, shard,
+                        [maze_spec(args.seed, i, args.sizes, algorithms, weights)
+                         for i in range(first, min(first + args.shard_size, args.count))])
+            for shard, first in enumerate(shards)
+        ]
+        # Shards finish in any order; the manifest is written in id order.
+        for job in jobs:
+            for entry in job.result():
+                manifest.write(json.dumps(entry) + "\n")
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Wrote {args.count} mazes in {len(shards)} shards to {args.out} in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
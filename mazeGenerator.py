@@ -0,0 +1,34 @@
+import random
+import time
+import os
+
+# The generators live in the algorithms package; these names stay
+# importable from here for existing scripts.
+from algorithms.generators import GENERATORS, backtracker, binary_tree, generate, sidewinder
+
+
+class MazeGenerator:
+    def __init__(self, width, height, seed=None, algorithm="backtracker"):
+        width, height = width | 1, height | 1
+        self.width = width
+        self.height = height
+        self.algorithm = algorithm
+        if seed is None:
+            seed = int(time.time()) + random.randint(0, 1000)
+        self.seed = seed
+        self.maze = [['#' for _ in range(width)] for _ in range(height)]
+        self.start = (1, 1)
+        self.goal = (height - 2, width - 2)
+
+    def generate(self):
+        self.maze = generate(self.width, self.height, self.algorithm, self.seed)
+
+    def save_maze(self, filename="generated_maze/m.txt"):
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, 'w') as f:
+            for row in self.maze:
+                f.write(''.join(row) + '\n')
+        return filename
+
+    def display_maze(self):
+        return self.maze
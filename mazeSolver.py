@@ -79,6 +79,8 @@ class Maze():
                     row.append(False)
             self.walls.append(row)
 
+        self.adjacency = self.build_adjacency()
+        self.components = None
         self.solution = None
 
 
@@ -102,23 +104,66 @@ class Maze():
 
 
     def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
-
-        result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
-        return result
+        return self.adjacency[state]
+
+
+    def build_adjacency(self):
+        """Precomputes (action, state) moves for every open cell."""
+        adjacency = {}
+        for row in range(self.height):
+            for col in range(self.width):
+                if self.walls[row][col]:
+                    continue
+                candidates = [
+                    ("up", (row - 1, col)),
+                    ("down", (row + 1, col)),
+                    ("left", (row, col - 1)),
+                    ("right", (row, col + 1))
+                ]
+                adjacency[(row, col)] = tuple(
+                    (action, (r, c)) for action, (r, c) in candidates
+                    if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]
+                )
+        return adjacency
+
+
+    def index_components(self):
+        """Labels connected regions so unsolvable mazes fail without searching."""
+        components = {}
+        label = 0
+        for seed in self.adjacency:
+            if seed in components:
+                continue
+            label += 1
+            components[seed] = label
+            stack = [seed]
+            while stack:
+                state = stack.pop()
+                for _, neighbor in self.adjacency[state]:
+                    if neighbor not in components:
+                        components[neighbor] = label
+                        stack.append(neighbor)
+        self.components = components
+        return components
 
 
     def solve(self):
         """Finds a solution to maze, if one exists."""
+        for _ in self.iter_solve(batch_size=None):
+            pass
+
+
+    def iter_solve(self, batch_size=64):
+        """Solves lazily, yielding (expanded, added) lists of states every
+        batch_size expansions. With batch_size=None nothing is yielded."""
+
+        record = batch_size is not None
+        expanded, added = [], []
+
+        # Start and goal in different regions can never be joined
+        if self.components is not None and self.components[self.start] != self.components[self.goal]:
+            self.num_explored = 0
+            raise Exception("no solution")
 
         # Keep track of number of states explored
         self.num_explored = 0
@@ -142,6 +187,13 @@ class Maze():
             node = frontier.remove()
             self.num_explored += 1
 
+            # Stream what happened since the last batch
+            if record:
+                expanded.append(node.state)
+                if len(expanded) >= batch_size:
+                    yield expanded, added
+                    expanded, added = [], []
+
             # If node is the goal, then we have a solution
             if node.state == self.goal:
                 actions = []
@@ -153,6 +205,8 @@ class Maze():
                 actions.reverse()
                 cells.reverse()
                 self.solution = (actions, cells)
+                if record:
+                    yield expanded, added
                 return
 
             # Mark node as explored
@@ -163,6 +217,8 @@ class Maze():
                 if not frontier.contains_state(state) and state not in self.explored:
                     child = Node(state=state, parent=node, action=action)
                     frontier.add(child)
+                    if record:
+                        added.append(state)
 
 
     def output_image(self, filename, show_solution=True, show_explored=False):
@@ -216,21 +272,26 @@ class Maze():
         img.save(filename)
 
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        sys.exit("Usage: python mazeSolver.py maze.txt")
+
+    m = Maze(argv[0])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve()
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+
+    output_folder = "solved_maze"
+    os.makedirs(output_folder, exist_ok=True)
 
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-# m.output_image("solved_maze/maze.png", show_explored=True)
+    maze_name = os.path.splitext(os.path.basename(argv[0]))[0]
+    m.output_image(f"{output_folder}/{maze_name}.png", show_explored=True)
 
-output_folder = "solved_maze"
-os.makedirs(output_folder, exist_ok=True)
 
-maze_name = os.path.splitext(os.path.basename(sys.argv[1]))[0]
-m.output_image(f"{output_folder}/{maze_name}.png", show_explored=True)
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import subprocess
+from ui import main
 
-# subprocess.run(["python", "t.py", "maze/m.txt"])
-subprocess.run(["python", "ui.py"])
+if __name__ == "__main__":
+    main()
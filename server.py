@@ -0,0 +1,304 @@
+import argparse
+import asyncio
+import contextlib
+import functools
+import inspect
+import json
+import math
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from algorithms import SOLVERS, solver_class
+
+# Per-worker cache of loaded solvers, keyed by (path, mtime, algorithm)
+_solvers = OrderedDict()
+_cache_size = 32
+
+
+def _init_worker(cache_size):
+    global _cache_size
+    _cache_size = cache_size
+
+
+def _solver(path, mtime, algorithm):
+    key = (path, mtime, algorithm)
+    solver = _solvers.get(key)
+    if solver is None:
+        solver = _solvers[key] = solver_class(algorithm)(path)
+        if hasattr(solver, "index_components"):
+            solver.index_components()
+        if len(_solvers) > _cache_size:
+            _solvers.popitem(last=False)
+    else:
+        _solvers.move_to_end(key)
+    return solver
+
+
+def solve_batch(path, mtime, jobs):
+    """Runs in a pool worker: solves one maze once per (algorithm, deadline,
+    max_expansions) job, returning results in job order. Deadlines are
+    absolute time.time() values, so time spent queued counts against them."""
+    results = []
+    for job in jobs:
+        algorithm, deadline, max_expansions = job
+        try:
+            solver = _solver(path, mtime, algorithm)
+            bounds = {}
+            if deadline is not None:
+                bounds["deadline"] = max(0.0, deadline - time.time())
+            if max_expansions is not None:
+                bounds["max_expansions"] = max_expansions
+            start_time = time.perf_counter()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                path_cells = solver.solve(**bounds)
+            elapsed = time.perf_counter() - start_time
+        except Exception as e:
+            results.append({"error": f"{type(e).__name__}: {e}"})
+            continue
+        result = {
+            "path": [list(cell) for cell in path_cells] if path_cells is not None else None,
+            "length": len(path_cells) if path_cells is not None else None,
+            "explored": getattr(solver, "num_explored", None),
+            "time_us": round(elapsed * 1_000_000, 2),
+        }
+        if bounds:
+            result["partial"] = getattr(solver, "partial", False)
+            result["stats"] = {
+                name: list(value) if isinstance(value, tuple) else value
+                for name, value in getattr(solver, "stats", {}).items()
+            }
+        results.append(result)
+    return results
+
+
+class SolveService:
+    """Batches concurrent solve requests per maze onto a process pool.
+
+    Requests for the same maze that arrive within `batch_window` seconds are
+    sent to the pool as one job, and each distinct (algorithm, deadline,
+    max_expansions) is solved once for the whole batch. Parsed mazes stay resident in the pool workers,
+    up to `cache_size` solvers per worker.
+    """
+
+    def __init__(self, root, workers=None, cache_size=32, batch_window=0.002):
+        self.root = os.path.realpath(root)
+        self.batch_window = batch_window
+        # Forked workers would inherit the listening socket and whichever
+        # connection was open when the pool started, so a client reading
+        # until close would never see EOF. Start them from a fresh process.
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_init_worker, initargs=(cache_size,))
+        self.pending = {}
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    def resolve(self, maze):
+        path = os.path.realpath(os.path.join(self.root, maze))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"maze {maze!r} is outside the maze directory")
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"no maze named {maze!r}")
+        return path
+
+    async def solve(self, maze, algorithm, deadline=None, max_expansions=None):
+        """`deadline` is in seconds from now; the solve returns a partial
+        path when it or `max_expansions` runs out."""
+        if algorithm not in SOLVERS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {sorted(SOLVERS)}")
+        bounds = {name for name, value in (("deadline", deadline), ("max_expansions", max_expansions))
+                  if value is not None}
+        if not bounds <= set(inspect.signature(solver_class(algorithm).solve).parameters):
+            raise ValueError(f"{algorithm} does not support 'deadline' or 'max_expansions'")
+        if deadline is not None:
+            if not math.isfinite(deadline):
+                raise ValueError("'deadline' must be a finite number of seconds")
+            deadline = time.time() + deadline
+        path = self.resolve(maze)
+        key = (path, os.stat(path).st_mtime_ns)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self.pending.get(key)
+        if batch is None:
+            batch = self.pending[key] = []
+            loop.call_later(self.batch_window, self.flush, key)
+        batch.append(((algorithm, deadline, max_expansions), future))
+        return await future
+
+    def flush(self, key):
+        batch = self.pending.pop(key)
+        positions = {}
+        for job, _ in batch:
+            positions.setdefault(job, len(positions))
+        # Futures paired with the position of their job's result
+        waiting = [(positions[job], future) for job, future in batch]
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(self.pool, solve_batch, *key, list(positions))
+        job.add_done_callback(functools.partial(self.deliver, waiting))
+
+    @staticmethod
+    def deliver(waiting, job):
+        for position, future in waiting:
+            if future.done():
+                continue
+            if job.cancelled():
+                future.cancel()
+            elif job.exception() is not None:
+                future.set_exception(job.exception())
+            else:
+                future.set_result(job.result()[position])
+
+
+class HTTPHandler:
+    """Minimal HTTP/1.1 front end: GET /solve?maze=...&algorithm=... or
+    POST /solve with a JSON body carrying the same fields. Optional
+    `deadline` (seconds) and `max_expansions` bound the solve."""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def __call__(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self.respond(writer, "400 Bad Request", {"error": "malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.respond(writer, "400 Bad Request", {"error": "invalid Content-Length"}, False)
+                    break
+                body = await reader.readexactly(length)
+
+                status, payload = await self.handle(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer, status, payload, keep_alive):
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    @staticmethod
+    def number(params, name, kind):
+        """params[name] as a float or int (`kind`), or None if absent. Query
+        strings give text, JSON bodies give numbers; a fractional value
+        for an int is refused rather than truncated."""
+        value = params.get(name)
+        if value is None:
+            return None
+        if isinstance(value, str):
+            try:
+                value = kind(value)
+            except ValueError:
+                pass
+        if isinstance(value, bool) or not isinstance(value, (int, float) if kind is float else int):
+            raise ValueError(f"{name!r} must be {'a number' if kind is float else 'an integer'}")
+        return kind(value)
+
+    async def handle(self, method, target, body):
+        url = urlsplit(target)
+        if url.path != "/solve":
+            return "404 Not Found", {"error": "not found"}
+        if method == "GET":
+            params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        elif method == "POST":
+            try:
+                params = json.loads(body or b"{}")
+            except json.JSONDecodeError as e:
+                return "400 Bad Request", {"error": f"invalid JSON: {e}"}
+        else:
+            return "405 Method Not Allowed", {"error": "use GET or POST"}
+        if not isinstance(params, dict):
+            return "400 Bad Request", {"error": "expected a JSON object"}
+
+        maze, algorithm = params.get("maze"), params.get("algorithm", "astar")
+        if not maze:
+            return "400 Bad Request", {"error": "missing 'maze'"}
+        if not isinstance(maze, str) or not isinstance(algorithm, str):
+            return "400 Bad Request", {"error": "'maze' and 'algorithm' must be strings"}
+        try:
+            deadline = self.number(params, "deadline", float)
+            max_expansions = self.number(params, "max_expansions", int)
+        except ValueError as e:
+            return "400 Bad Request", {"error": str(e)}
+        try:
+            result = await self.service.solve(maze, algorithm, deadline, max_expansions)
+        except ValueError as e:
+            return "400 Bad Request", {"error": str(e)}
+        except FileNotFoundError as e:
+            return "404 Not Found", {"error": str(e)}
+        except Exception as e:
+            return "500 Internal Server Error", {"error": f"{type(e).__name__}: {e}"}
+        if "error" in result:
+            return "500 Internal Server Error", {"maze": maze, "algorithm": algorithm, **result}
+        return "200 OK", {"maze": maze, "algorithm": algorithm, **result}
+
+
+async def serve(args):
+    service = SolveService(args.root, workers=args.workers, cache_size=args.cache_size,
+                           batch_window=args.batch_window)
+    handler = HTTPHandler(service)
+    if args.unix:
+        server = await asyncio.start_unix_server(handler, path=args.unix)
+        where = args.unix
+    else:
+        server = await asyncio.start_server(handler, args.host, args.port)
+        where = f"http://{args.host}:{args.port}"
+    print(f"Serving mazes from {service.root} on {where}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve maze solves over HTTP.")
+    parser.add_argument("--root", default="sample_maze", help="directory mazes are looked up in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="solver processes (default: CPU count)")
+    parser.add_argument("--cache-size", type=int, default=32, help="loaded solvers kept per worker")
+    parser.add_argument("--batch-window", type=float, default=0.002,
+                        help="seconds to collect requests for the same maze")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
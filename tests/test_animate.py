@@ -0,0 +1,58 @@
+import io
+import random
+import struct
+
+import pytest
+from PIL import Image
+
+from animate import FREE, PALETTE, UNCHANGED, lzw_encode
+
+
+def decode(data, width, height):
+    """Pixels of `data` encoded as a one-image GIF, as decoded by PIL."""
+    codes = lzw_encode(data, 3, UNCHANGED)
+    gif = b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF2, 0, 0)
+    gif += b''.join(bytes(colour) for colour in PALETTE)
+    gif += b"\x2c" + struct.pack("<HHHHB", 0, 0, width, height, 0) + b"\x03"
+    gif += b''.join(bytes((len(codes[i:i + 255]),)) + codes[i:i + 255] for i in range(0, len(codes), 255))
+    gif += b"\x00\x3b"
+    with Image.open(io.BytesIO(gif)) as image:
+        image.load()
+        return image.tobytes()
+
+
+def noise(n, seed=0):
+    rng = random.Random(seed)
+    return bytes(rng.randrange(8) for _ in range(n))
+
+
+def runs(n, longest, gap, seed=0):
+    # Runs of UNCHANGED shorter than `longest`, between up to `gap` bytes
+    # of noise, so that the table fills up while run codes are in use
+    rng = random.Random(seed)
+    out = bytearray()
+    while len(out) < n:
+        out += bytes((UNCHANGED,)) * rng.randrange(1, longest)
+        out += noise(rng.randrange(1, gap), rng.random())
+    return bytes(out[:n])
+
+
+CASES = {
+    "single byte": bytes((FREE,)),
+    "short run": bytes((UNCHANGED,)) * 15,
+    "min_run": bytes((UNCHANGED,)) * 16,
+    "whole image unchanged": bytes((UNCHANGED,)) * 100 * 100,
+    "run at both ends": bytes((UNCHANGED,)) * 300 + noise(50) + bytes((UNCHANGED,)) * 300,
+    "other bytes repeated": bytes((3,)) * 5000,
+    # Enough distinct strings to fill the table and force clear codes
+    "noise": noise(100 * 100),
+    "runs and noise": runs(200 * 200, 400, 300),
+    "short runs and noise": runs(200 * 200, 60, 20),
+}
+
+
+@pytest.mark.parametrize("data", CASES.values(), ids=CASES.keys())
+def test_lzw_round_trip(data):
+    width = 100 if len(data) % 100 == 0 else len(data)
+    height = len(data) // width
+    assert decode(data, width, height) == data
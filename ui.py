@@ -1,10 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
-import random
 import time
 import os
-from PIL import Image, ImageTk
+
+from mazeGenerator import MazeGenerator
 
 # Import maze solving algorithms
 from algorithms.dfs import MazeSolverDFS
@@ -12,44 +12,6 @@ from algorithms.bfs import MazeSolverBFS
 from algorithms.ucs import MazeSolverUCS
 from algorithms.astar import MazeSolverAStar
 
-class MazeGenerator:
-    def __init__(self, width, height):
-        self.width = width
-        self.height = height
-        self.maze = [['#' for _ in range(width)] for _ in range(height)]
-        self.visited = [[False for _ in range(width)] for _ in range(height)]
-        self.start = (1, 1)
-        self.goal = (height - 2, width - 2)
-        random.seed(int(time.time()) + random.randint(0, 1000))
-        self.maze[self.start[0]][self.start[1]] = 'A'
-        self.visited[self.start[0]][self.start[1]] = True
-
-    def generate(self):
-        self.dfs(self.start[0], self.start[1])
-        self.maze[self.goal[0]][self.goal[1]] = 'B'
-
-    def dfs(self, x, y):
-        directions = [(-2, 0), (2, 0), (0, -2), (0, 2)]
-        random.shuffle(directions)
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 < nx < self.height and 0 < ny < self.width and not self.visited[nx][ny]:
-                self.maze[x + dx // 2][y + dy // 2] = ' '
-                self.visited[nx][ny] = True
-                self.maze[nx][ny] = ' '
-                self.dfs(nx, ny)
-
-    def save_maze(self, filename="generated_maze/m.txt"):
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'w') as f:
-            for row in self.maze:
-                f.write(''.join(row) + '\n')
-        return filename
-
-    def display_maze(self):
-        return self.maze
-
-
 class MazeSolverApp:
     def __init__(self, root):
         self.root = root
@@ -269,6 +231,8 @@ class MazeSolverApp:
                     )
 
     def solve_maze(self):
+        from PIL import Image, ImageTk
+
         # Clear previous solution images
         self.left_solution_label.config(image='')
         self.right_solution_label.config(image='')